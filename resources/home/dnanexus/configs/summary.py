@@ -472,11 +472,11 @@ def add_dynamic_values(
     SV_df: pd.DataFrame,
     fusion_count: int,
     nb_germline_variants: int,
-    SNV_df_columns: list = None,
-    gain_df_columns: list = None,
-    loss_df_columns: list = None,
-    SV_df_columns: list = None,
-    germline_df_columns: list = None,
+    SNV_df_columns: pd.Index = None,
+    gain_df_columns: pd.Index = None,
+    loss_df_columns: pd.Index = None,
+    SV_df_columns: pd.Index = None,
+    germline_df_columns: pd.Index = None,
 ) -> dict:
     """Add dynamic values for the Summary sheet
 
@@ -490,16 +490,16 @@ def add_dynamic_values(
     nb_germline_variants : int
         Number of germline variants in the germline data in order to find where
         the appropriate lookup is in the germline sheet
-    SNV_df_columns : list
-        List of columns for the SNV dataframe
-    gain_df_columns : list
-        List of columns for the gain dataframe
-    loss_df_columns : list
-        List of columns for the loss dataframe
-    SV_df_columns : list
-        List of columns for the SV dataframe
-    germline_df_columns : list
-        List of columns for the germline dataframe
+    SNV_df_columns : pd.Index
+        Columns of the SNV dataframe
+    gain_df_columns : pd.Index
+        Columns of the gain dataframe
+    loss_df_columns : pd.Index
+        Columns of the loss dataframe
+    SV_df_columns : pd.Index
+        Columns of the SV dataframe
+    germline_df_columns : pd.Index
+        Columns of the germline dataframe
 
     Returns
     -------
@@ -1,9 +1,17 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
 from pathlib import Path
 import re
 
+import numpy as np
 import pandas as pd
 
+from utils.excel_parsing import (
+    split_reported_variants,
+    split_structural_variants,
+)
+
 
 INPUT_PATTERNS = [
     r"[-_]reported_structural_variants\..*\.csv",
@@ -12,6 +20,14 @@ INPUT_PATTERNS = [
     r"\..*\.xlsx",
 ]
 
+INPUT_SUFFIXES = {".csv", ".xlsx", ".html"}
+
+# sheets of the output workbook containing the variants to check
+OUTPUT_SHEETS = ["SNV", "Germline", "Gain", "Loss", "SV"]
+
+# columns used to compare the structural variants
+CNV_COLUMNS = ["Gene", "GRCh38 coordinates"]
+
 
 def get_sample_id_from_files(files: list, patterns: list) -> dict:
     """Get the sample id from the new files detected and link sample ids to
@@ -58,8 +74,57 @@ def get_sample_id_from_files(files: list, patterns: list) -> dict:
     return file_dict
 
 
+def join_columns(df: pd.DataFrame) -> np.ndarray:
+    """Join the values of every row of the dataframe using " - "
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe containing the columns to join
+
+    Returns
+    -------
+    np.ndarray
+        Array with one joined string per row
+    """
+
+    if df.empty:
+        return np.array([], dtype=object)
+
+    # empty cells are read as nan which would make the whole joined row nan
+    columns = [df[column].fillna("") for column in df.columns]
+    return columns[0].str.cat(columns[1:], sep=" - ").to_numpy()
+
+
+def compare_variants(output_df: pd.DataFrame, input_df: pd.DataFrame) -> tuple:
+    """Compare the variants from the input csv and the output xlsx using the
+    joined values of their columns
+
+    Parameters
+    ----------
+    output_df : pd.DataFrame
+        Dataframe with the columns to compare from the output xlsx
+    input_df : pd.DataFrame
+        Dataframe with the columns to compare from the input csv
+
+    Returns
+    -------
+    tuple
+        Tuple of lists containing the unique variants from the input csv and
+        the output xlsx
+    """
+
+    output_variants = join_columns(output_df)
+    input_variants = join_columns(input_df)
+
+    value_input = np.setdiff1d(input_variants, output_variants).tolist()
+    value_output = np.setdiff1d(output_variants, input_variants).tolist()
+
+    return value_input, value_output
+
+
 def compare_somatic_snvs(
-    output_somatic_snv: pd.DataFrame, rv: pd.DataFrame
+    output_somatic_snv: pd.DataFrame, input_somatic_snv: pd.DataFrame
 ) -> tuple:
     """Compare the somatic variants from the input csv and the output xlsx
 
@@ -67,8 +132,9 @@ def compare_somatic_snvs(
     ----------
     output_somatic_snv : pd.DataFrame
         Dataframe with the somatic variants from the output xlsx
-    rv : pd.DataFrame
-        Dataframe with the variants from the input reported variants csv
+    input_somatic_snv : pd.DataFrame
+        Dataframe with the somatic variants from the input reported variants
+        csv
 
     Returns
     -------
@@ -84,49 +150,37 @@ def compare_somatic_snvs(
     }
 
     # check somatic sheet
-    coor_SNV_output = {
-        tuple(row)
-        for i, row in output_somatic_snv[
-            ["GRCh38 coordinates", "Variant", "Predicted consequences"]
-        ]
-        .fillna("")
-        .iterrows()
-    }
+    coor_SNV_output = output_somatic_snv[
+        ["GRCh38 coordinates", "Variant", "Predicted consequences"]
+    ].fillna("")
 
-    coor_SNV_input = rv[rv["Origin"].str.lower().str.contains("somatic")][
+    # copy the columns as they are modified below and the somatic variants are
+    # a selection of the reported variants
+    coor_SNV_input = input_somatic_snv[
         [
             "GRCh38 coordinates;ref/alt allele",
             "CDS change and protein change",
             "Predicted consequences",
         ]
-    ]
+    ].copy()
     coor_SNV_input["CDS change and protein change"] = (
         coor_SNV_input["CDS change and protein change"]
-        .str.replace("[SVIG]", "")
-        .str.replace("N/A", "")
+        .str.replace("[SVIG]", "", regex=False)
+        .str.replace("N/A", "", regex=False)
     )
 
-    coor_SNV_input["Predicted consequences"] = coor_SNV_input[
-        "Predicted consequences"
-    ].str.split(";", expand=True)[0]
-
-    coor_SNV_input = {
-        tuple(row)
-        for i, row in coor_SNV_input.rename(columns=rename_dict).iterrows()
-    }
-
-    value_input = [
-        " - ".join(ele) for ele in coor_SNV_input.difference(coor_SNV_output)
-    ]
-    value_output = [
-        " - ".join(ele) for ele in coor_SNV_output.difference(coor_SNV_input)
-    ]
+    # only the first consequence is written in the SNV sheet
+    coor_SNV_input["Predicted consequences"] = (
+        coor_SNV_input["Predicted consequences"].str.split(";", n=1).str[0]
+    )
 
-    return value_input, value_output
+    return compare_variants(
+        coor_SNV_output, coor_SNV_input.rename(columns=rename_dict)
+    )
 
 
 def compare_germline_snvs(
-    output_germline_snv: pd.DataFrame, rv: pd.DataFrame
+    output_germline_snv: pd.DataFrame, input_germline_snv: pd.DataFrame
 ) -> tuple:
     """Compare the germline variants from the input csv and the output xlsx
 
@@ -134,8 +188,9 @@ def compare_germline_snvs(
     ----------
     output_germline_snv : pd.DataFrame
         Dataframe with the germline variants from the output xlsx
-    rv : pd.DataFrame
-        Dataframe with the variants from the input reported variants csv
+    input_germline_snv : pd.DataFrame
+        Dataframe with the germline variants from the input reported variants
+        csv
 
     Returns
     -------
@@ -150,46 +205,26 @@ def compare_germline_snvs(
     }
 
     # remove the first 3 lines because they never should have variants
-    coor_germline_output = output_germline_snv.iloc[3:, 1:3]
-    coor_germline_output.iloc[:, 0] = coor_germline_output.iloc[
-        :, 0
-    ].str.replace("\n", ";")
-    coor_germline_output.iloc[:, 1] = coor_germline_output.iloc[
-        :, 1
-    ].str.replace("\n", ";")
-    coor_germline_output = coor_germline_output.dropna()
-
-    coor_germline_input = {
-        tuple(row)
-        for i, row in rv[rv["Origin"].str.lower().str.contains("germline")][
-            [
-                "GRCh38 coordinates;ref/alt allele",
-                "CDS change and protein change",
-            ]
-        ].iterrows()
-    }
-
-    coor_germline_output = {
-        tuple(row)
-        for i, row in coor_germline_output.rename(
-            columns=rename_dict
-        ).iterrows()
-    }
+    coor_germline_output = (
+        output_germline_snv.iloc[3:, 1:3]
+        .apply(lambda column: column.str.replace("\n", ";", regex=False))
+        .dropna()
+    )
 
-    value_input = [
-        " - ".join(ele)
-        for ele in coor_germline_input.difference(coor_germline_output)
-    ]
-    value_output = [
-        " - ".join(ele)
-        for ele in coor_germline_output.difference(coor_germline_input)
+    coor_germline_input = input_germline_snv[
+        [
+            "GRCh38 coordinates;ref/alt allele",
+            "CDS change and protein change",
+        ]
     ]
 
-    return value_input, value_output
+    return compare_variants(
+        coor_germline_output.rename(columns=rename_dict), coor_germline_input
+    )
 
 
 def compare_gain_cnvs(
-    output_gain_cnvs: pd.DataFrame, rsv: pd.DataFrame
+    output_gain_cnvs: pd.DataFrame, input_gain_cnvs: pd.DataFrame
 ) -> tuple:
     """Compare the gain variants from the input csv and the output xlsx
 
@@ -197,8 +232,9 @@ def compare_gain_cnvs(
     ----------
     output_gain_cnvs : pd.DataFrame
         Dataframe with the gain variants from the output xlsx
-    rsv : pd.DataFrame
-        Dataframe with the variants from the input structural variants csv
+    input_gain_cnvs : pd.DataFrame
+        Dataframe with the gain variants from the input structural variants
+        csv
 
     Returns
     -------
@@ -207,32 +243,14 @@ def compare_gain_cnvs(
         the output xlsx
     """
 
-    coor_gain_output = {
-        tuple(row)
-        for i, row in output_gain_cnvs[
-            ["Gene", "GRCh38 coordinates"]
-        ].iterrows()
-    }
-
-    coor_gain_input = {
-        tuple(row)
-        for i, row in rsv[rsv["Type"].str.lower().str.contains("gain")][
-            ["Gene", "GRCh38 coordinates"]
-        ].iterrows()
-    }
-
-    value_input = [
-        " - ".join(ele) for ele in coor_gain_input.difference(coor_gain_output)
-    ]
-    value_output = [
-        " - ".join(ele) for ele in coor_gain_output.difference(coor_gain_input)
-    ]
-
-    return value_input, value_output
+    return compare_variants(
+        output_gain_cnvs[CNV_COLUMNS],
+        input_gain_cnvs[CNV_COLUMNS],
+    )
 
 
 def compare_loss_cnvs(
-    output_loss_cnvs: pd.DataFrame, rsv: pd.DataFrame
+    output_loss_cnvs: pd.DataFrame, input_loss_cnvs: pd.DataFrame
 ) -> tuple:
     """Compare the loss variants from the input csv and the output xlsx
 
@@ -240,8 +258,9 @@ def compare_loss_cnvs(
     ----------
     output_loss_cnvs : pd.DataFrame
         Dataframe with the loss variants from the output xlsx
-    rsv : pd.DataFrame
-        Dataframe with the variants from the input structural variant csv
+    input_loss_cnvs : pd.DataFrame
+        Dataframe with the loss variants from the input structural variants
+        csv
 
     Returns
     -------
@@ -251,32 +270,14 @@ def compare_loss_cnvs(
     """
 
     # check loss sheet
-    coor_loss_output = {
-        tuple(row)
-        for i, row in output_loss_cnvs[
-            ["Gene", "GRCh38 coordinates"]
-        ].iterrows()
-    }
-
-    coor_loss_input = {
-        tuple(row)
-        for i, row in rsv[rsv["Type"].str.lower().str.match("loss|loh")][
-            ["Gene", "GRCh38 coordinates"]
-        ].iterrows()
-    }
-
-    value_input = [
-        " - ".join(ele) for ele in coor_loss_input.difference(coor_loss_output)
-    ]
-    value_output = [
-        " - ".join(ele) for ele in coor_loss_output.difference(coor_loss_input)
-    ]
-
-    return value_input, value_output
+    return compare_variants(
+        output_loss_cnvs[CNV_COLUMNS],
+        input_loss_cnvs[CNV_COLUMNS],
+    )
 
 
 def compare_fusion_cnvs(
-    output_sv_cnvs: pd.DataFrame, rsv: pd.DataFrame
+    output_sv_cnvs: pd.DataFrame, input_fusion_cnvs: pd.DataFrame
 ) -> tuple:
     """Compare the fusion variants from the input csv and the output xlsx
 
@@ -284,8 +285,9 @@ def compare_fusion_cnvs(
     ----------
     output_sv_cnvs : pd.DataFrame
         Dataframe with the fusion variants from the output xlsx
-    rsv : pd.DataFrame
-        Dataframe with the variants from the input structural variants csv
+    input_fusion_cnvs : pd.DataFrame
+        Dataframe with the fusion variants from the input structural variants
+        csv
 
     Returns
     -------
@@ -295,26 +297,10 @@ def compare_fusion_cnvs(
     """
 
     # check SV sheet
-    coor_sv_output = {
-        tuple(row)
-        for i, row in output_sv_cnvs[["Gene", "GRCh38 coordinates"]].iterrows()
-    }
-
-    coor_sv_input = {
-        tuple(row)
-        for i, row in rsv[
-            ~rsv["Type"].str.lower().str.contains(r"loss|loh|gain")
-        ][["Gene", "GRCh38 coordinates"]].iterrows()
-    }
-
-    value_input = [
-        " - ".join(ele) for ele in coor_sv_input.difference(coor_sv_output)
-    ]
-    value_output = [
-        " - ".join(ele) for ele in coor_sv_output.difference(coor_sv_input)
-    ]
-
-    return value_input, value_output
+    return compare_variants(
+        output_sv_cnvs[CNV_COLUMNS],
+        input_fusion_cnvs[CNV_COLUMNS],
+    )
 
 
 def parse_files(files: list) -> dict:
@@ -335,7 +321,9 @@ def parse_files(files: list) -> dict:
 
     for file in files:
         if file.name.endswith(".xlsx"):
-            dfs["xlsx"] = pd.read_excel(file, sheet_name=None)
+            dfs["xlsx"] = pd.read_excel(
+                file, sheet_name=OUTPUT_SHEETS, engine="calamine"
+            )
         elif file.name.endswith(".csv"):
             df = pd.read_csv(file)
 
@@ -347,54 +335,107 @@ def parse_files(files: list) -> dict:
     return dfs
 
 
+def process_sample(files: list) -> list:
+    """Compare the variants of the input files and the output xlsx of a sample
+
+    Parameters
+    ----------
+    files : list
+        List of files for the sample
+
+    Returns
+    -------
+    list
+        List of tuples containing the sheet and the unique variants from the
+        input csv and the output xlsx for the sheets with differences
+    """
+
+    file_dfs = parse_files(files)
+
+    # split the input variants the same way the workbook generation does so
+    # that the same variants are expected in each sheet
+    variants = split_reported_variants(file_dfs["rv"])
+    structural_variants = split_structural_variants(file_dfs["rsv"])
+
+    somatic_differences = compare_somatic_snvs(
+        file_dfs["xlsx"]["SNV"], variants["somatic"]
+    )
+    germline_differences = compare_germline_snvs(
+        file_dfs["xlsx"]["Germline"], variants["germline"]
+    )
+    gain_differences = compare_gain_cnvs(
+        file_dfs["xlsx"]["Gain"], structural_variants["gain"]
+    )
+    loss_differences = compare_loss_cnvs(
+        file_dfs["xlsx"]["Loss"], structural_variants["loss"]
+    )
+    sv_differences = compare_fusion_cnvs(
+        file_dfs["xlsx"]["SV"], structural_variants["fusion"]
+    )
+
+    errors = []
+
+    for sheet, differences in {
+        "somatic_snv": somatic_differences,
+        "germline_snv": germline_differences,
+        "gain_cnv": gain_differences,
+        "loss_cnv": loss_differences,
+        "fusion_cnv": sv_differences,
+    }.items():
+        input_diff, output_diff = differences
+
+        if input_diff or output_diff:
+            errors.append((sheet, input_diff, output_diff))
+
+    return errors
+
+
 def main(folder):
+    # only the csv, xlsx and html files can match the input patterns
     file_dict = get_sample_id_from_files(
-        [Path(file) for file in Path(folder).glob("*")],
+        [
+            file
+            for file in Path(folder).iterdir()
+            if file.suffix in INPUT_SUFFIXES
+        ],
         INPUT_PATTERNS,
     )
 
-    errors = []
+    # the app checks a single sample, only start processes when several
+    # independent samples are given
+    if len(file_dict) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(len(file_dict), os.cpu_count())
+        ) as executor:
+            sample_errors = list(
+                executor.map(process_sample, file_dict.values())
+            )
+    else:
+        sample_errors = [process_sample(files) for files in file_dict.values()]
+
+    all_errors = {
+        sample: errors
+        for sample, errors in zip(file_dict, sample_errors)
+        if errors
+    }
 
-    for sample, files in file_dict.items():
-        file_dfs = parse_files(files)
-
-        somatic_differences = compare_somatic_snvs(
-            file_dfs["xlsx"]["SNV"], file_dfs["rv"]
-        )
-        germline_differences = compare_germline_snvs(
-            file_dfs["xlsx"]["Germline"], file_dfs["rv"]
-        )
-        gain_differences = compare_gain_cnvs(
-            file_dfs["xlsx"]["Gain"], file_dfs["rsv"]
-        )
-        loss_differences = compare_loss_cnvs(
-            file_dfs["xlsx"]["Loss"], file_dfs["rsv"]
-        )
-        sv_differences = compare_fusion_cnvs(
-            file_dfs["xlsx"]["SV"], file_dfs["rsv"]
-        )
-
-        for sheet, differences in {
-            "somatic_snv": somatic_differences,
-            "germline_snv": germline_differences,
-            "gain_cnv": gain_differences,
-            "loss_cnv": loss_differences,
-            "fusion_cnv": sv_differences,
-        }.items():
-            input_diff, output_diff = differences
-
-            if input_diff or output_diff:
-                errors.append((sheet, input_diff, output_diff))
-
-        if errors:
-            msg = f"Unequal variants found in {sample}:\n"
+    # report the differences for all the samples at once
+    if all_errors:
+        msg_lines = []
 
-            for sheet, input_diffs, output_diffs in errors:
-                msg += f"- {sheet}\n"
-                msg += f"  - Input : {' | '.join(sorted(input_diffs))}\n"
-                msg += f"  - Output : {' | '.join(sorted(output_diffs))}\n"
+        for sample, errors in all_errors.items():
+            msg_lines.append(f"Unequal variants found in {sample}:")
 
-            raise AssertionError(msg)
+            for sheet, input_diffs, output_diffs in errors:
+                msg_lines.append(f"- {sheet}")
+                msg_lines.append(
+                    f"  - Input : {' | '.join(sorted(input_diffs))}"
+                )
+                msg_lines.append(
+                    f"  - Output : {' | '.join(sorted(output_diffs))}"
+                )
+
+        raise AssertionError("\n".join(msg_lines) + "\n")
 
 
 if __name__ == "__main__":
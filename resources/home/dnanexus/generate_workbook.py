@@ -1,11 +1,43 @@
 import argparse
+from concurrent.futures import as_completed, ThreadPoolExecutor
 import os
 from pathlib import Path
 
 import pandas as pd
 
 from configs import tables, germline, snv, gain, loss, refgene, sv, summary
-from utils import excel_parsing, excel_writing, html, vcf
+from utils import excel_parsing, excel_writing, html, misc, vcf
+
+
+def parse_input(info_dict: dict):
+    """Parse an input file according to its type
+
+    Parameters
+    ----------
+    info_dict : dict
+        Dict containing the file path and the type of the input, and the
+        path to the index for the vcf
+
+    Returns
+    -------
+    dict, pd.DataFrame or BeautifulSoup
+        Parsed data of the input
+    """
+
+    file = info_dict["id"]
+    file_type = info_dict["type"]
+
+    # the inputs are parsed in threads, write the newline with the message so
+    # that the lines of the threads don't get mixed
+    print(f"Parsing {file}...\n", end="")
+
+    if file_type == "vcf":
+        vcf_reader = vcf.open_vcf(file, info_dict.get("index"))
+        return vcf.get_clinvar_info(vcf_reader)
+    elif file_type == "xls" or file_type == "csv":
+        return excel_parsing.open_file(file, file_type)
+    elif file_type == "html":
+        return html.open_html(file)
 
 
 def main(**kwargs):
@@ -24,8 +56,11 @@ def main(**kwargs):
             "id": kwargs["cytological_bands"],
             "type": "xls",
         },
-        "clinvar": {"id": kwargs["clinvar"], "type": "vcf"},
-        "clinvar_index": {"id": kwargs["clinvar_index"], "type": "index"},
+        "clinvar": {
+            "id": kwargs["clinvar"],
+            "type": "vcf",
+            "index": kwargs["clinvar_index"],
+        },
         "supplementary_html": {
             "id": kwargs["supplementary_html"],
             "type": "html",
@@ -40,85 +75,108 @@ def main(**kwargs):
         },
     }
 
-    # loop through the inputs to parse the files
-    for name, info_dict in inputs.items():
-        file = info_dict["id"]
-        file_type = info_dict["type"]
-        print(f"Parsing {file}...")
+    parsed_inputs = {}
+
+    # the inputs are independent from each other, parse them at the same time
+    with ThreadPoolExecutor(max_workers=len(inputs)) as executor:
+        futures = {}
 
-        if file_type == "vcf":
-            vcf_reader = vcf.open_vcf(file)
-            data = vcf.get_clinvar_info(vcf_reader)
-        elif file_type == "xls" or file_type == "csv":
-            data = excel_parsing.open_file(file, file_type)
-        elif file_type == "html":
-            data = html.open_html(file)
+        for name, info_dict in inputs.items():
+            futures[executor.submit(parse_input, info_dict)] = name
 
-        inputs[name]["data"] = data
+        # store the data as soon as a file is parsed
+        for future in as_completed(futures):
+            parsed_inputs[futures[future]] = future.result()
+
+    hotspots = parsed_inputs["hotspots"]
+    refgene_raw = parsed_inputs["reference_gene_groups"]
+    panelapp_raw = parsed_inputs["panelapp"]
+    cyto = parsed_inputs["cytological_bands"]
+    clinvar = parsed_inputs["clinvar"]
+    soup = parsed_inputs["supplementary_html"]
+    reported_variants = parsed_inputs["reported_variants"]
+    reported_structural_variants = parsed_inputs[
+        "reported_structural_variants"
+    ]
 
     print("Process refgene data...")
-    refgene_df = excel_parsing.process_refgene(
-        inputs["reference_gene_groups"]["data"]
-    )
+    refgene_df = excel_parsing.process_refgene(refgene_raw)
     print("Process panelapp data...")
-    panelapp_dfs = excel_parsing.process_panelapp(inputs["panelapp"]["data"])
+    panelapp_dfs = excel_parsing.process_panelapp(panelapp_raw)
 
     # list of tuple allowing:
     # - the writing of the column (1st element)
-    # - by mapping 2nd element to 4th element
-    # - using the 3rd element as a reference df
-    # - and getting the data from the column named by the 5th element
-    lookup_refgene_data = (
-        ("COSMIC Driver", "Gene", refgene_df, "Gene", "COSMIC_Alteration"),
-        ("COSMIC Entities", "Gene", refgene_df, "Gene", "COSMIC_Entities"),
-        ("Paed Driver", "Gene", refgene_df, "Gene", "Paed_Alteration"),
-        ("Paed Entities", "Gene", refgene_df, "Gene", "Paed_Entities"),
-        ("Sarc Driver", "Gene", refgene_df, "Gene", "Sarcoma_Alteration"),
-        ("Sarc Entities", "Gene", refgene_df, "Gene", "Sarcoma_Entites"),
-        ("Neuro Driver", "Gene", refgene_df, "Gene", "Neuro_Alteration"),
-        ("Neuro Entities", "Gene", refgene_df, "Gene", "Neuro_Entities"),
-        ("Ovary Driver", "Gene", refgene_df, "Gene", "Ovarian_Alteration"),
-        ("Ovary Entities", "Gene", refgene_df, "Gene", "Ovarian_Entities"),
-        ("Haem Driver", "Gene", refgene_df, "Gene", "Haem_Alteration"),
-        ("Haem Entities", "Gene", refgene_df, "Gene", "Haem_Entities"),
+    # - by mapping 2nd element to the Gene column of the refgene df
+    # - and getting the data from the column named by the 3rd element
+    refgene_columns = (
+        ("COSMIC Driver", "Gene", "COSMIC_Alteration"),
+        ("COSMIC Entities", "Gene", "COSMIC_Entities"),
+        ("Paed Driver", "Gene", "Paed_Alteration"),
+        ("Paed Entities", "Gene", "Paed_Entities"),
+        ("Sarc Driver", "Gene", "Sarcoma_Alteration"),
+        ("Sarc Entities", "Gene", "Sarcoma_Entites"),
+        ("Neuro Driver", "Gene", "Neuro_Alteration"),
+        ("Neuro Entities", "Gene", "Neuro_Entities"),
+        ("Ovary Driver", "Gene", "Ovarian_Alteration"),
+        ("Ovary Entities", "Gene", "Ovarian_Entities"),
+        ("Haem Driver", "Gene", "Haem_Alteration"),
+        ("Haem Entities", "Gene", "Haem_Entities"),
+    )
+
+    # index the refgene data on the genes once as it is shared by all the
+    # lookups of all the variant types
+    refgene_lookup_df = misc.build_lookup_table(
+        refgene_df, "Gene", [column for _, _, column in refgene_columns]
+    )
+    lookup_refgene_data = tuple(
+        (
+            new_column,
+            mapping_column_target_df,
+            refgene_lookup_df[col_to_look_up],
+        )
+        for (
+            new_column,
+            mapping_column_target_df,
+            col_to_look_up,
+        ) in refgene_columns
     )
 
+    # split the variants once for the germline and SNV sheets
+    variants = excel_parsing.split_reported_variants(reported_variants)
+
     print("Process germline data...")
     germline_df = excel_parsing.process_reported_variants_germline(
-        inputs["reported_variants"]["data"],
-        inputs["clinvar"]["data"],
-        panelapp_dfs,
+        variants["germline"], clinvar, panelapp_dfs
     )
     print("Process SNV data...")
     somatic_df = excel_parsing.process_reported_variants_somatic(
-        inputs["reported_variants"]["data"],
-        lookup_refgene_data,
-        inputs["hotspots"]["data"],
-        inputs["cytological_bands"]["data"],
+        variants["somatic"], lookup_refgene_data, hotspots, cyto
     )
+
+    # split the structural variants once for the gain, loss and SV sheets
+    structural_variants = excel_parsing.split_structural_variants(
+        reported_structural_variants
+    )
+
     print("Process Gain data...")
     gain_df = excel_parsing.process_reported_SV(
-        inputs["reported_structural_variants"]["data"],
+        structural_variants["gain"],
         lookup_refgene_data,
-        "gain",
         "OG_Amp",
         "Focality",
         "Full transcript",
     )
     print("Process Loss data...")
     loss_df = excel_parsing.process_reported_SV(
-        inputs["reported_structural_variants"]["data"],
+        structural_variants["loss"],
         lookup_refgene_data,
-        "loss|loh",
         "TSG_Hom",
         "SNV_LOH",
     )
     print("Process SV data...")
     fusion_df, fusion_count, alternative_columns = (
         excel_parsing.process_fusion_SV(
-            inputs["reported_structural_variants"]["data"],
-            lookup_refgene_data,
-            inputs["cytological_bands"]["data"],
+            structural_variants["fusion"], lookup_refgene_data, cyto
         )
     )
 
@@ -133,8 +191,10 @@ def main(**kwargs):
         },
     )
 
+    # the summary config only iterates over the columns, pass the column
+    # indexes directly instead of copying them in lists
     df_columns = {
-        arg_name: list(df.columns) if df is not None else None
+        arg_name: df.columns if df is not None else None
         for arg_name, df in {
             "SNV_df_columns": somatic_df,
             "gain_df_columns": gain_df,
@@ -160,9 +220,12 @@ def main(**kwargs):
     }
 
     print("Download HTML images...")
-    # get images and tables from the html file
-    html_images = html.download_images(inputs["supplementary_html"]["data"])
-    html_tables = html.get_tables(inputs["supplementary_html"]["id"])
+    # get images and tables from the html file, the tables are parsed while
+    # the images are downloading
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        images_future = executor.submit(html.download_images, soup)
+        html_tables = html.get_tables(soup)
+        html_images = images_future.result()
 
     data_tables = {}
 
@@ -186,7 +249,7 @@ def main(**kwargs):
             "sheet_name": "QC",
             "html_tables": data_tables,
             "html_images": html_images,
-            "soup": inputs["supplementary_html"]["data"],
+            "soup": soup,
         },
         {"sheet_name": "Plot", "html_images": html_images},
         {"sheet_name": "Signatures", "html_images": html_images},
@@ -220,6 +283,10 @@ def main(**kwargs):
     # # create folder in order to grab the file in the bash main script
     Path("output").mkdir(exist_ok=True)
 
+    # openpyxl is needed here: the configs use openpyxl styles and the sheets
+    # are styled, merged and given dropdowns/images after their cells are
+    # written, which streaming engines (i.e. xlsxwriter in constant_memory
+    # mode) don't allow
     with pd.ExcelWriter(
         f"output/{sample_id}.xlsx", engine="openpyxl"
     ) as output_excel:
@@ -1,13 +1,48 @@
+from types import MappingProxyType
 from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
+from pandas.testing import assert_frame_equal
 import pytest
 
 from utils import excel_parsing
 
-
-@pytest.fixture()
+# refgene columns added to the variants, empty in most of the test data
+DRIVER_COLS = (
+    "COSMIC Driver",
+    "COSMIC Entities",
+    "Paed Driver",
+    "Paed Entities",
+    "Sarc Driver",
+    "Sarc Entities",
+    "Neuro Driver",
+    "Neuro Entities",
+    "Ovary Driver",
+    "Ovary Entities",
+    "Haem Driver",
+    "Haem Entities",
+)
+
+
+def empty_driver_block(nb_rows: int) -> dict:
+    """Build the data for empty refgene columns
+
+    Parameters
+    ----------
+    nb_rows : int
+        Number of rows of the dataframe
+
+    Returns
+    -------
+    dict
+        Dict of the refgene columns with empty strings for every row
+    """
+
+    return {column: [""] * nb_rows for column in DRIVER_COLS}
+
+
+@pytest.fixture(scope="session")
 def germline_variant_data():
     df = pd.DataFrame(
         {
@@ -35,11 +70,10 @@ def germline_variant_data():
         }
     )
 
-    yield df
-    del df
+    return df
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def panelapp_dfs():
     panelapp_dfs = {
         "Adult_v2.2": pd.DataFrame(
@@ -56,11 +90,11 @@ def panelapp_dfs():
         ),
     }
 
-    yield panelapp_dfs
-    del panelapp_dfs
+    # the fixture is shared by the session, make the dict read-only
+    return MappingProxyType(panelapp_dfs)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def somatic_variant_data():
     test_input = pd.DataFrame(
         {
@@ -91,26 +125,14 @@ def somatic_variant_data():
             "Alt allele/total read depth": ["depth1", "depth2", "depth3"],
             "Gene mode of action": ["mode1", "mode2", "mode3"],
             "VAF": ["0.3;0.1", 0.6, 0.5],
-            "COSMIC Driver": ["", "", ""],
-            "COSMIC Entities": ["", "", ""],
-            "Paed Driver": ["", "", ""],
-            "Paed Entities": ["", "", ""],
-            "Sarc Driver": ["", "", ""],
-            "Sarc Entities": ["", "", ""],
-            "Neuro Driver": ["", "", ""],
-            "Neuro Entities": ["", "", ""],
-            "Ovary Driver": ["", "", ""],
-            "Ovary Entities": ["", "", ""],
-            "Haem Driver": ["", "", ""],
-            "Haem Entities": ["", "", ""],
+            **empty_driver_block(3),
         }
     )
 
-    yield test_input
-    del test_input
+    return test_input
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def hotspots():
     hotspots = {
         "HS_Samples": pd.DataFrame(
@@ -128,11 +150,10 @@ def hotspots():
         ),
     }
 
-    yield hotspots
-    del hotspots
+    return MappingProxyType(hotspots)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def cyto():
     cyto = {
         "Cyto": pd.DataFrame(
@@ -143,11 +164,10 @@ def cyto():
         )
     }
 
-    yield cyto
-    del cyto
+    return MappingProxyType(cyto)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def sv_variant_data():
     data = pd.DataFrame(
         {
@@ -160,26 +180,14 @@ def sv_variant_data():
             "Size": [10, 20, 30],
             "Chromosomal bands": ["cyto1;cyto2", "cyto3;cyto4", "cyto5;cyto6"],
             "Gene mode of action": ["mode1", "mode2", "mode3"],
-            "COSMIC Driver": ["", "", ""],
-            "COSMIC Entities": ["", "", ""],
-            "Paed Driver": ["", "", ""],
-            "Paed Entities": ["", "", ""],
-            "Sarc Driver": ["", "", ""],
-            "Sarc Entities": ["", "", ""],
-            "Neuro Driver": ["", "", ""],
-            "Neuro Entities": ["", "", ""],
-            "Ovary Driver": ["", "", ""],
-            "Ovary Entities": ["", "", ""],
-            "Haem Driver": ["", "", ""],
-            "Haem Entities": ["", "", ""],
+            **empty_driver_block(3),
         }
     )
 
-    yield data
-    del data
+    return data
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fusion_data():
     fusion_data = pd.DataFrame(
         {
@@ -208,11 +216,10 @@ def fusion_data():
         }
     )
 
-    yield fusion_data
-    del fusion_data
+    return fusion_data
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def refgene_data():
     refgene_df = pd.DataFrame(
         {
@@ -232,118 +239,469 @@ def refgene_data():
         }
     )
 
-    yield refgene_df
-    del refgene_df
+    return refgene_df
 
 
-class TestProcessReportedVariantsGermline:
+# output of the patched clinvar lookup for the germline variants
+CLINVAR_GERMLINE_SINGLE_ROW = pd.DataFrame(
+    {
+        "Gene": ["gene1"],
+        "GRCh38 coordinates;ref/alt allele": ["coor1"],
+        "CDS change and protein change": ["c.1"],
+        "Predicted consequences": ["consequence1"],
+        "Genotype": ["0/1"],
+        "Population germline allele frequency (GE | gnomAD)": ["ge1|freq1"],
+        "Gene mode of action": ["deletion1"],
+        "clnsigconf": ["sig1"],
+    }
+)
+
+
+CLINVAR_GERMLINE_MULTIPLE_ROWS = pd.DataFrame(
+    {
+        "Gene": ["gene1", "gene3"],
+        "GRCh38 coordinates;ref/alt allele": ["coor1", "coor3"],
+        "CDS change and protein change": ["c.1", "c.3"],
+        "Predicted consequences": ["consequence1", "consequence3"],
+        "Genotype": ["0/1", "1|1"],
+        "Population germline allele frequency (GE | gnomAD)": [
+            "ge1|freq1",
+            "ge2|freq2",
+        ],
+        "Gene mode of action": ["deletion1", "deletion2"],
+        "clnsigconf": ["sig1", "sig2"],
+    }
+)
+
+
+EXPECTED_GERMLINE_SINGLE_ROW = pd.DataFrame(
+    {
+        "Gene": ["gene1"],
+        "GRCh38 coordinates;ref/alt allele": ["coor1"],
+        "CDS change and protein change": ["c.1"],
+        "Predicted consequences": ["consequence1"],
+        "Genotype": ["0/1"],
+        "Population germline allele frequency (GE | gnomAD)": ["ge1|freq1"],
+        "Gene mode of action": ["deletion1"],
+        "clnsigconf": ["sig1"],
+        "Tumour VAF": [""],
+        "PanelApp Adult_v2.2": ["mode1"],
+        "PanelApp Childhood_v4.0": ["mode2"],
+    }
+)
+
+
+EXPECTED_GERMLINE_MULTIPLE_ROWS = pd.DataFrame(
+    {
+        "Gene": ["gene1", "gene3"],
+        "GRCh38 coordinates;ref/alt allele": ["coor1", "coor3"],
+        "CDS change and protein change": ["c.1", "c.3"],
+        "Predicted consequences": ["consequence1", "consequence3"],
+        "Genotype": ["0/1", "1|1"],
+        "Population germline allele frequency (GE | gnomAD)": [
+            "ge1|freq1",
+            "ge2|freq2",
+        ],
+        "Gene mode of action": ["deletion1", "deletion2"],
+        "clnsigconf": ["sig1", "sig2"],
+        "Tumour VAF": ["", ""],
+        "PanelApp Adult_v2.2": ["mode1", "mode3"],
+        "PanelApp Childhood_v4.0": ["mode2", "mode4"],
+    }
+)
+
+
+EXPECTED_SOMATIC_SINGLE_ROW = pd.DataFrame(
+    {
+        "Domain": ["domain1"],
+        "Gene": ["gene1"],
+        "GRCh38 coordinates": ["coor1"],
+        "Cyto": ["cyto1"],
+        "RefSeq IDs": ["refseq_id1"],
+        "CDS change and protein change": ["c.1;p.Leu40Arg"],
+        "Predicted consequences": ["consequence1"],
+        "Error flag": [""],
+        "Population germline allele frequency (GE | gnomAD)": ["0.1 | 0.2"],
+        "VAF": [0.3],
+        "LOH": ["0.1"],
+        "Alt allele/total read depth": ["depth1"],
+        "Gene mode of action": ["mode1"],
+        "Variant class": [""],
+        "Comments": [""],
+        "Canonical": [""],
+        "TSG_NMD": [""],
+        "TSG_LOH": [""],
+        "Splice fs?": [""],
+        "SpliceAI": [""],
+        "REVEL": [""],
+        "OG_3' Ter": [""],
+        "Recurrence somatic database": [""],
+        "HS_Total": ["total1"],
+        "HS_Mut": ["mutation1"],
+        "HS_Tissue": ["tissue1"],
+        **empty_driver_block(1),
+        "MTBP c.": ["gene1:c.1"],
+        "MTBP p.": ["gene1:L40R"],
+    }
+)
+
+
+EXPECTED_SOMATIC_MULTIPLE_ROWS = pd.DataFrame(
+    {
+        "Domain": ["domain1", "domain3"],
+        "Gene": ["gene1", "gene3"],
+        "GRCh38 coordinates": ["coor1", "coor3"],
+        "Cyto": ["cyto1", "cyto2"],
+        "RefSeq IDs": ["refseq_id1", "refseq_id3"],
+        "CDS change and protein change": [
+            "c.1;p.Leu40Arg",
+            "c.3;p.Leu2135Val",
+        ],
+        "Predicted consequences": ["consequence1", "consequence3"],
+        "Error flag": ["", "consequence4"],
+        "Population germline allele frequency (GE | gnomAD)": [
+            "0.1 | 0.2",
+            "- | -",
+        ],
+        "VAF": [0.3, 0.5],
+        "LOH": ["0.1", ""],
+        "Alt allele/total read depth": ["depth1", "depth3"],
+        "Gene mode of action": ["mode1", "mode3"],
+        "Variant class": ["", ""],
+        "Comments": ["", ""],
+        "Canonical": ["", "[SVIG]"],
+        "TSG_NMD": ["", ""],
+        "TSG_LOH": ["", ""],
+        "Splice fs?": ["", ""],
+        "SpliceAI": ["", ""],
+        "REVEL": ["", ""],
+        "OG_3' Ter": ["", ""],
+        "Recurrence somatic database": ["", ""],
+        "HS_Total": ["total1", "total2"],
+        "HS_Mut": ["mutation1", "mutation2"],
+        "HS_Tissue": ["tissue1", "tissue2"],
+        **empty_driver_block(2),
+        "MTBP c.": ["gene1:c.1", "gene3:c.3"],
+        "MTBP p.": ["gene1:L40R", "gene3:L2135V"],
+    }
+)
+
+
+def sv_columns(*check_columns) -> list:
+    """Get the columns of the processed gain or loss variants
+
+    Parameters
+    ----------
+    check_columns : tuple
+        Names of the additional empty columns for the type of variant
+
+    Returns
+    -------
+    list
+        List of the columns in the order of the processed dataframe
+    """
+
+    return (
+        [
+            "Event domain",
+            "Gene",
+            "RefSeq IDs",
+            "Impacted transcript region",
+            "GRCh38 coordinates",
+            "Type",
+            "Copy Number",
+            "Size",
+            "Cyto 1",
+            "Cyto 2",
+            "Gene mode of action",
+            "Variant class",
+            "Comments",
+        ]
+        + list(check_columns)
+        + list(DRIVER_COLS)
+    )
+
+
+# the columns missing from the data below are empty in the processed variants
+EXPECTED_GAIN_SINGLE_ROW = pd.DataFrame(
+    {
+        "Event domain": ["domain1"],
+        "Gene": ["gene1"],
+        "RefSeq IDs": ["refseq_id1"],
+        "Impacted transcript region": ["region1"],
+        "GRCh38 coordinates": ["coor1"],
+        "Type": ["GAIN"],
+        "Copy Number": [1],
+        "Size": ["10"],
+        "Cyto 1": ["cyto1"],
+        "Cyto 2": ["cyto2"],
+        "Gene mode of action": ["mode1"],
+    }
+).reindex(columns=sv_columns("new_column1", "new_column2"), fill_value="")
+
+
+EXPECTED_GAIN_MULTIPLE_ROWS = pd.DataFrame(
+    {
+        "Event domain": ["domain1", "domain2"],
+        "Gene": ["gene1", "gene2"],
+        "RefSeq IDs": ["refseq_id1", "refseq_id2"],
+        "Impacted transcript region": ["region1", "region2"],
+        "GRCh38 coordinates": ["coor1", "coor2"],
+        "Type": ["GAIN", "GAIN"],
+        "Copy Number": [1, 3],
+        "Size": ["10", "20"],
+        "Cyto 1": ["cyto1", "cyto3"],
+        "Cyto 2": ["cyto2", "cyto4"],
+        "Gene mode of action": ["mode1", "mode2"],
+    }
+).reindex(
+    columns=sv_columns("new_column1", "new_column2", "new_column3"),
+    fill_value="",
+)
+
+
+EXPECTED_LOSS_SINGLE_ROW = pd.DataFrame(
+    {
+        "Event domain": ["domain3"],
+        "Gene": ["gene3"],
+        "RefSeq IDs": ["refseq_id3"],
+        "Impacted transcript region": ["region3"],
+        "GRCh38 coordinates": ["coor3"],
+        "Type": ["LOSS"],
+        "Copy Number": [2],
+        "Size": ["30"],
+        "Cyto 1": ["cyto5"],
+        "Cyto 2": ["cyto6"],
+        "Gene mode of action": ["mode3"],
+    }
+).reindex(columns=sv_columns("new_column1"), fill_value="")
+
+
+EXPECTED_FUSION_SINGLE_ROW = pd.DataFrame(
+    {
+        "Event domain": ["domain2"],
+        "Gene": ["gene2;gene3"],
+        "RefSeq IDs": ["refseq_id2"],
+        "Impacted transcript region": ["region2"],
+        "GRCh38 coordinates": ["coor2"],
+        "Type": ["type1"],
+        "Fusion_1": ["type2"],
+        "Size": ["200,000"],
+        (
+            "Population germline allele frequency (GESG | GECG for "
+            "somatic SVs or AF | AUC for germline CNVs)"
+        ): ["freq2"],
+        "Paired reads": ["7/133"],
+        "Split reads": [""],
+        "Cyto\nGene_1": ["-"],
+        "Cyto\nGene_2": ["cyto2"],
+        "Gene mode of action": ["mode2"],
+        "Variant class": [""],
+        "Comments": [""],
+        "OG_Fusion": [""],
+        "OG_IntDup": [""],
+        "OG_IntDel": [""],
+        "Disruptive": [""],
+        "Gene_1": ["gene2"],
+        "Gene_2": ["gene3"],
+    }
+)
+
+
+EXPECTED_FUSION_MULTIPLE_ROWS = pd.DataFrame(
+    {
+        "Event domain": ["domain2", "domain3"],
+        "Gene": ["gene2;gene3", "gene4;gene5;gene6"],
+        "RefSeq IDs": ["refseq_id2", "refseq_id3"],
+        "Impacted transcript region": ["region2", "region3"],
+        "GRCh38 coordinates": ["coor2", "coor3"],
+        "Type": ["type1", "type3"],
+        "Fusion_1": ["type2", "type4"],
+        "Fusion_2": [None, "type5"],
+        "Size": ["200,000", "300,000"],
+        (
+            "Population germline allele frequency (GESG | GECG for "
+            "somatic SVs or AF | AUC for germline CNVs)"
+        ): ["freq2", "freq3"],
+        "Paired reads": ["7/133", "1/69"],
+        "Split reads": ["", "18/95"],
+        "Cyto\nGene_1": ["-", "cyto3"],
+        "Cyto\nGene_2": ["cyto2", "-"],
+        "Cyto\nGene_3": ["-", "-"],
+        "Gene mode of action": ["mode2", "mode3"],
+        "Variant class": ["", ""],
+        "Comments": ["", ""],
+        "OG_Fusion": ["", ""],
+        "OG_IntDup": ["", ""],
+        "OG_IntDel": ["", ""],
+        "Disruptive": ["", ""],
+        "Gene_1": ["gene2", "gene4"],
+        "Gene_2": ["gene3", "gene5"],
+        "Gene_3": [None, "gene6"],
+    }
+)
+
+
+EXPECTED_REFGENE = pd.DataFrame(
+    {
+        "Gene": pd.Categorical(["gene1", "gene2", "gene3", "gene4"]),
+        "Comments": ["somatic_data1", np.nan, "somatic_data4", np.nan],
+        "COSMIC_Alteration": [
+            "somatic_data2",
+            np.nan,
+            "somatic_data5",
+            np.nan,
+        ],
+        "COSMIC_Entities": [
+            "somatic_data3",
+            np.nan,
+            "somatic_data6",
+            np.nan,
+        ],
+        "Haem_Alteration": [np.nan, "haem_data1", np.nan, np.nan],
+        "Haem_Entities": [np.nan, "haem_data2", np.nan, np.nan],
+        "Haem_Comments": [np.nan, "haem_data3", np.nan, np.nan],
+        "Paed_Alteration": ["paed_data1", np.nan, np.nan, np.nan],
+        "Paed_Entities": ["paed_data2", np.nan, np.nan, np.nan],
+        "Paed_Comments": ["paed_data3", np.nan, np.nan, np.nan],
+        "Ovarian_Alteration": [
+            np.nan,
+            np.nan,
+            "ovarian_data1",
+            np.nan,
+        ],
+        "Ovarian_Entities": [np.nan, np.nan, "ovarian_data2", np.nan],
+        "Ovarian_Comments": [np.nan, np.nan, "ovarian_data3", np.nan],
+        "Sarcoma_Alteration": [np.nan, np.nan, np.nan, "sarc_data1"],
+        "Sarcoma_Entites": [np.nan, np.nan, np.nan, "sarc_data2"],
+        "Sarcoma_Comments": [np.nan, np.nan, np.nan, "sarc_data3"],
+        "Neuro_Alteration": [
+            "neuro_data5",
+            "neuro_data1",
+            np.nan,
+            np.nan,
+        ],
+        "Neuro_Entities": [
+            "neuro_data6",
+            "neuro_data2",
+            np.nan,
+            np.nan,
+        ],
+        "Neuro_Comments": [
+            "neuro_data7",
+            "neuro_data3",
+            np.nan,
+            np.nan,
+        ],
+    }
+)
+
+
+EXPECTED_REFGENE_WITH_VARIANT_DATA = pd.DataFrame(
+    {
+        "Gene": ["gene1", "gene2", "gene3"],
+        "Alteration": ["alt1", "alt2", ""],
+        "Entities": ["ent1", "ent2", ""],
+        "Paed_Alteration": ["paed_alt1", "", "paed_alt2"],
+        "Paed_Entities": ["paed_ent1", "", "paed_alt2"],
+        "Sarcoma_Alteration": ["", "sarc_alt1", "sarc_alt2"],
+        "Sarcoma_Entities": ["", "sarc_ent1", "sarc_alt2"],
+        "Neuro_Alteration": ["", "", "neuro_alt1"],
+        "Neuro_Entities": ["", "", "neuro_ent1"],
+        "Ovarian_Alteration": ["", "", ""],
+        "Ovarian_Entities": ["", "", ""],
+        "Haem_Alteration": ["haem_alt1", "haem_alt2", "haem_alt3"],
+        "Haem_Entities": ["haem_ent1", "haem_ent2", "haem_ent3"],
+        "SNV": ["data1", "-", "-"],
+        "CN": ["-", "1", "3"],
+        "SV_gene_1": ["type1", "-", "-"],
+        "SV_gene_2": ["-", "type1", "-"],
+        "On Target": ["Y", "Y", "Y"],
+    }
+)
+
+
+class TestSplitReportedVariants:
     @pytest.mark.parametrize(
         "test_input", [{}, {"Origin": ["somatic"], "Data": ["data1"]}]
     )
-    def test_process_no_germline(self, test_input):
-        test_inputs = [pd.DataFrame(test_input), None, None]
-
-        assert (
-            excel_parsing.process_reported_variants_germline(*test_inputs)
-            is None
+    def test_no_germline(self, test_input):
+        test_output = excel_parsing.split_reported_variants(
+            pd.DataFrame(test_input)
         )
 
-    @patch("utils.excel_parsing.vcf.find_clinvar_info")
-    def test_process_single_row(
-        self, mock_vcf_data, germline_variant_data, panelapp_dfs
-    ):
-        mock_vcf_data.return_value = pd.DataFrame(
-            {
-                "Gene": ["gene1"],
-                "GRCh38 coordinates;ref/alt allele": ["coor1"],
-                "CDS change and protein change": ["c.1"],
-                "Predicted consequences": ["consequence1"],
-                "Genotype": ["0/1"],
-                "Population germline allele frequency (GE | gnomAD)": [
-                    "ge1|freq1"
-                ],
-                "Gene mode of action": ["deletion1"],
-                "clnsigconf": ["sig1"],
-            }
-        )
+        assert test_output["germline"].empty
 
-        test_output = excel_parsing.process_reported_variants_germline(
-            germline_variant_data.iloc[[0], :], "", panelapp_dfs
+    @pytest.mark.parametrize(
+        "test_input", [{}, {"Origin": ["germline"], "Data": ["data1"]}]
+    )
+    def test_no_somatic(self, test_input):
+        test_output = excel_parsing.split_reported_variants(
+            pd.DataFrame(test_input)
         )
 
-        expected_output = pd.DataFrame(
-            {
-                "Gene": ["gene1"],
-                "GRCh38 coordinates;ref/alt allele": ["coor1"],
-                "CDS change and protein change": ["c.1"],
-                "Predicted consequences": ["consequence1"],
-                "Genotype": ["0/1"],
-                "Population germline allele frequency (GE | gnomAD)": [
-                    "ge1|freq1"
-                ],
-                "Gene mode of action": ["deletion1"],
-                "clnsigconf": ["sig1"],
-                "Tumour VAF": [""],
-                "PanelApp Adult_v2.2": ["mode1"],
-                "PanelApp Childhood_v4.0": ["mode2"],
-            }
+        assert test_output["somatic"].empty
+
+    def test_split_origins(self, germline_variant_data):
+        test_output = excel_parsing.split_reported_variants(
+            germline_variant_data
         )
 
-        assert test_output.equals(expected_output)
+        assert test_output["germline"]["Gene"].to_list() == ["gene1", "gene3"]
+        assert test_output["somatic"]["Gene"].to_list() == ["gene2"]
 
-    @patch("utils.excel_parsing.vcf.find_clinvar_info")
-    def test_process_multiple_rows(
-        self, mock_vcf_data, germline_variant_data, panelapp_dfs
-    ):
-        mock_vcf_data.return_value = pd.DataFrame(
-            {
-                "Gene": ["gene1", "gene3"],
-                "GRCh38 coordinates;ref/alt allele": ["coor1", "coor3"],
-                "CDS change and protein change": ["c.1", "c.3"],
-                "Predicted consequences": ["consequence1", "consequence3"],
-                "Genotype": ["0/1", "1|1"],
-                "Population germline allele frequency (GE | gnomAD)": [
-                    "ge1|freq1",
-                    "ge2|freq2",
-                ],
-                "Gene mode of action": ["deletion1", "deletion2"],
-                "clnsigconf": ["sig1", "sig2"],
-            }
-        )
 
-        test_output = excel_parsing.process_reported_variants_germline(
-            germline_variant_data, "", panelapp_dfs
+class TestProcessReportedVariantsGermline:
+    @pytest.fixture(autouse=True)
+    def mock_vcf_data(self):
+        # the clinvar data is not used in these tests, patch the lookup for
+        # all the tests of the class
+        with patch.object(excel_parsing.vcf, "find_clinvar_info") as mock:
+            yield mock
+
+    def test_process_no_germline(self):
+        test_inputs = [pd.DataFrame({}), None, None]
+
+        assert (
+            excel_parsing.process_reported_variants_germline(*test_inputs)
+            is None
         )
 
-        expected_output = pd.DataFrame(
-            {
-                "Gene": ["gene1", "gene3"],
-                "GRCh38 coordinates;ref/alt allele": ["coor1", "coor3"],
-                "CDS change and protein change": ["c.1", "c.3"],
-                "Predicted consequences": ["consequence1", "consequence3"],
-                "Genotype": ["0/1", "1|1"],
-                "Population germline allele frequency (GE | gnomAD)": [
-                    "ge1|freq1",
-                    "ge2|freq2",
-                ],
-                "Gene mode of action": ["deletion1", "deletion2"],
-                "clnsigconf": ["sig1", "sig2"],
-                "Tumour VAF": ["", ""],
-                "PanelApp Adult_v2.2": ["mode1", "mode3"],
-                "PanelApp Childhood_v4.0": ["mode2", "mode4"],
-            }
+    @pytest.mark.parametrize(
+        "rows, clinvar_output, expected_output",
+        [
+            ([0], CLINVAR_GERMLINE_SINGLE_ROW, EXPECTED_GERMLINE_SINGLE_ROW),
+            (
+                [0, 2],
+                CLINVAR_GERMLINE_MULTIPLE_ROWS,
+                EXPECTED_GERMLINE_MULTIPLE_ROWS,
+            ),
+        ],
+        ids=["single_row", "multiple_rows"],
+    )
+    def test_process_rows(
+        self,
+        mock_vcf_data,
+        rows,
+        clinvar_output,
+        expected_output,
+        germline_variant_data,
+        panelapp_dfs,
+    ):
+        # the processor adds its columns to the returned dataframe
+        mock_vcf_data.return_value = clinvar_output.copy()
+
+        test_output = excel_parsing.process_reported_variants_germline(
+            germline_variant_data.iloc[rows, :], "", panelapp_dfs
         )
 
-        assert test_output.equals(expected_output)
+        assert_frame_equal(test_output, expected_output)
 
 
 class TestProcessReportedVariantsSomatic:
-    @pytest.mark.parametrize(
-        "test_input", [{}, {"Origin": ["germline"], "Data": ["data1"]}]
-    )
-    def test_process_no_somatic(self, test_input, hotspots, cyto):
+    def test_process_no_somatic(self, hotspots, cyto):
         test_inputs = [
-            pd.DataFrame(test_input),
+            pd.DataFrame({}),
             tuple(),
             hotspots,
             cyto,
@@ -354,123 +712,25 @@ class TestProcessReportedVariantsSomatic:
             is None
         )
 
-    def test_process_single_row(self, somatic_variant_data, hotspots, cyto):
-        test_output = excel_parsing.process_reported_variants_somatic(
-            somatic_variant_data.iloc[[0], :],
-            (),
-            hotspots,
-            cyto,
-        )
-
-        expected_output = pd.DataFrame(
-            {
-                "Domain": ["domain1"],
-                "Gene": ["gene1"],
-                "GRCh38 coordinates": ["coor1"],
-                "Cyto": ["cyto1"],
-                "RefSeq IDs": ["refseq_id1"],
-                "CDS change and protein change": ["c.1;p.Leu40Arg"],
-                "Predicted consequences": ["consequence1"],
-                "Error flag": [""],
-                "Population germline allele frequency (GE | gnomAD)": [
-                    "0.1 | 0.2"
-                ],
-                "VAF": [0.3],
-                "LOH": ["0.1"],
-                "Alt allele/total read depth": ["depth1"],
-                "Gene mode of action": ["mode1"],
-                "Variant class": [""],
-                "Comments": [""],
-                "Canonical": [""],
-                "TSG_NMD": [""],
-                "TSG_LOH": [""],
-                "Splice fs?": [""],
-                "SpliceAI": [""],
-                "REVEL": [""],
-                "OG_3' Ter": [""],
-                "Recurrence somatic database": [""],
-                "HS_Total": ["total1"],
-                "HS_Mut": ["mutation1"],
-                "HS_Tissue": ["tissue1"],
-                "COSMIC Driver": [""],
-                "COSMIC Entities": [""],
-                "Paed Driver": [""],
-                "Paed Entities": [""],
-                "Sarc Driver": [""],
-                "Sarc Entities": [""],
-                "Neuro Driver": [""],
-                "Neuro Entities": [""],
-                "Ovary Driver": [""],
-                "Ovary Entities": [""],
-                "Haem Driver": [""],
-                "Haem Entities": [""],
-                "MTBP c.": ["gene1:c.1"],
-                "MTBP p.": ["gene1:L40R"],
-            }
-        )
-
-        assert test_output.equals(expected_output)
-
-    def test_process_multiple_rows(self, somatic_variant_data, hotspots, cyto):
+    @pytest.mark.parametrize(
+        "rows, expected_output",
+        [
+            ([0], EXPECTED_SOMATIC_SINGLE_ROW),
+            ([0, 2], EXPECTED_SOMATIC_MULTIPLE_ROWS),
+        ],
+        ids=["single_row", "multiple_rows"],
+    )
+    def test_process_rows(
+        self, rows, expected_output, somatic_variant_data, hotspots, cyto
+    ):
         test_output = excel_parsing.process_reported_variants_somatic(
-            somatic_variant_data, (), hotspots, cyto
-        )
-
-        expected_output = pd.DataFrame(
-            {
-                "Domain": ["domain1", "domain3"],
-                "Gene": ["gene1", "gene3"],
-                "GRCh38 coordinates": ["coor1", "coor3"],
-                "Cyto": ["cyto1", "cyto2"],
-                "RefSeq IDs": ["refseq_id1", "refseq_id3"],
-                "CDS change and protein change": [
-                    "c.1;p.Leu40Arg",
-                    "c.3;p.Leu2135Val",
-                ],
-                "Predicted consequences": ["consequence1", "consequence3"],
-                "Error flag": ["", "consequence4"],
-                "Population germline allele frequency (GE | gnomAD)": [
-                    "0.1 | 0.2",
-                    "- | -",
-                ],
-                "VAF": [0.3, 0.5],
-                "LOH": ["0.1", ""],
-                "Alt allele/total read depth": ["depth1", "depth3"],
-                "Gene mode of action": ["mode1", "mode3"],
-                "Variant class": ["", ""],
-                "Comments": ["", ""],
-                "Canonical": ["", "[SVIG]"],
-                "TSG_NMD": ["", ""],
-                "TSG_LOH": ["", ""],
-                "Splice fs?": ["", ""],
-                "SpliceAI": ["", ""],
-                "REVEL": ["", ""],
-                "OG_3' Ter": ["", ""],
-                "Recurrence somatic database": ["", ""],
-                "HS_Total": ["total1", "total2"],
-                "HS_Mut": ["mutation1", "mutation2"],
-                "HS_Tissue": ["tissue1", "tissue2"],
-                "COSMIC Driver": ["", ""],
-                "COSMIC Entities": ["", ""],
-                "Paed Driver": ["", ""],
-                "Paed Entities": ["", ""],
-                "Sarc Driver": ["", ""],
-                "Sarc Entities": ["", ""],
-                "Neuro Driver": ["", ""],
-                "Neuro Entities": ["", ""],
-                "Ovary Driver": ["", ""],
-                "Ovary Entities": ["", ""],
-                "Haem Driver": ["", ""],
-                "Haem Entities": ["", ""],
-                "MTBP c.": ["gene1:c.1", "gene3:c.3"],
-                "MTBP p.": ["gene1:L40R", "gene3:L2135V"],
-            }
+            somatic_variant_data.iloc[rows, :], (), hotspots, cyto
         )
 
-        assert test_output.equals(expected_output)
+        assert_frame_equal(test_output, expected_output)
 
 
-class TestProcessReportedSV:
+class TestSplitStructuralVariants:
     @pytest.mark.parametrize(
         "test_input",
         [
@@ -479,231 +739,135 @@ class TestProcessReportedSV:
             {"Data": ["data1"]},
         ],
     )
-    def test_no_data(self, test_input):
-        test_inputs = [pd.DataFrame(test_input), (), "right_type"]
-        assert excel_parsing.process_reported_SV(*test_inputs) is None
+    def test_no_gain_or_loss(self, test_input):
+        test_output = excel_parsing.split_structural_variants(
+            pd.DataFrame(test_input)
+        )
 
-    def test_process_single_row_gain(self, sv_variant_data):
-        test_output = excel_parsing.process_reported_SV(
-            sv_variant_data.iloc[[0], :],
-            (),
-            "gain",
-            "new_column1",
-            "new_column2",
+        assert test_output["gain"].empty and test_output["loss"].empty
+
+    @pytest.mark.parametrize("test_input", [{}, {"Data": ["data1"]}])
+    def test_no_fusion(self, test_input):
+        test_output = excel_parsing.split_structural_variants(
+            pd.DataFrame(test_input)
         )
 
-        expected_output = pd.DataFrame(
-            {
-                "Event domain": ["domain1"],
-                "Gene": ["gene1"],
-                "RefSeq IDs": ["refseq_id1"],
-                "Impacted transcript region": ["region1"],
-                "GRCh38 coordinates": ["coor1"],
-                "Type": ["GAIN"],
-                "Copy Number": [1],
-                "Size": ["10"],
-                "Cyto 1": ["cyto1"],
-                "Cyto 2": ["cyto2"],
-                "Gene mode of action": ["mode1"],
-                "Variant class": [""],
-                "Comments": [""],
-                "new_column1": [""],
-                "new_column2": [""],
-                "COSMIC Driver": [""],
-                "COSMIC Entities": [""],
-                "Paed Driver": [""],
-                "Paed Entities": [""],
-                "Sarc Driver": [""],
-                "Sarc Entities": [""],
-                "Neuro Driver": [""],
-                "Neuro Entities": [""],
-                "Ovary Driver": [""],
-                "Ovary Entities": [""],
-                "Haem Driver": [""],
-                "Haem Entities": [""],
-            }
+        assert test_output["fusion"].empty
+
+    def test_split_types(self, fusion_data):
+        test_output = excel_parsing.split_structural_variants(
+            pd.concat([fusion_data, pd.DataFrame({"Type": ["LOH(1)"]})])
         )
 
-        assert test_output.equals(expected_output)
+        assert test_output["gain"]["Type"].to_list() == ["GAIN(1)"]
+        assert test_output["loss"]["Type"].to_list() == ["LOH(1)"]
+        assert test_output["fusion"]["Type"].to_list() == [
+            "type1;type2",
+            "type3;type4;type5",
+        ]
 
-    def test_process_single_row_loss(self, sv_variant_data):
-        test_output = excel_parsing.process_reported_SV(
-            sv_variant_data.iloc[[2], :],
-            (),
-            "loss",
-            "new_column1",
+    def test_cnv_type_not_at_the_start(self):
+        # the cnv types only count at the start of the type but keep the
+        # variant out of the fusions anywhere in it
+        test_output = excel_parsing.split_structural_variants(
+            pd.DataFrame({"Type": ["fusion;GAIN(2)", "Loss(1)"]})
         )
 
-        expected_output = pd.DataFrame(
-            {
-                "Event domain": ["domain3"],
-                "Gene": ["gene3"],
-                "RefSeq IDs": ["refseq_id3"],
-                "Impacted transcript region": ["region3"],
-                "GRCh38 coordinates": ["coor3"],
-                "Type": ["LOSS"],
-                "Copy Number": [2],
-                "Size": ["30"],
-                "Cyto 1": ["cyto5"],
-                "Cyto 2": ["cyto6"],
-                "Gene mode of action": ["mode3"],
-                "Variant class": [""],
-                "Comments": [""],
-                "new_column1": [""],
-                "COSMIC Driver": [""],
-                "COSMIC Entities": [""],
-                "Paed Driver": [""],
-                "Paed Entities": [""],
-                "Sarc Driver": [""],
-                "Sarc Entities": [""],
-                "Neuro Driver": [""],
-                "Neuro Entities": [""],
-                "Ovary Driver": [""],
-                "Ovary Entities": [""],
-                "Haem Driver": [""],
-                "Haem Entities": [""],
-            }
+        assert test_output["gain"].empty
+        assert test_output["loss"]["Type"].to_list() == ["Loss(1)"]
+        assert test_output["fusion"].empty
+
+
+class TestProcessReportedSV:
+    def test_no_data(self):
+        test_inputs = [pd.DataFrame({}), ()]
+        assert excel_parsing.process_reported_SV(*test_inputs) is None
+
+    @pytest.mark.parametrize(
+        "rows, check_columns, expected_output",
+        [
+            (
+                [0],
+                ("new_column1", "new_column2"),
+                EXPECTED_GAIN_SINGLE_ROW,
+            ),
+            (
+                [0, 1],
+                ("new_column1", "new_column2", "new_column3"),
+                EXPECTED_GAIN_MULTIPLE_ROWS,
+            ),
+        ],
+        ids=["single_row", "multiple_rows"],
+    )
+    def test_process_rows_gain(
+        self, rows, check_columns, expected_output, sv_variant_data
+    ):
+        test_output = excel_parsing.process_reported_SV(
+            sv_variant_data.iloc[rows, :], (), *check_columns
         )
 
-        assert test_output.equals(expected_output)
+        assert_frame_equal(test_output, expected_output)
 
-    def test_process_multiple_rows_gain(self, sv_variant_data):
+    def test_process_single_row_loss(self, sv_variant_data):
         test_output = excel_parsing.process_reported_SV(
-            sv_variant_data,
+            sv_variant_data.iloc[[2], :],
             (),
-            "gain",
             "new_column1",
-            "new_column2",
-            "new_column3",
         )
 
-        expected_output = pd.DataFrame(
-            {
-                "Event domain": ["domain1", "domain2"],
-                "Gene": ["gene1", "gene2"],
-                "RefSeq IDs": ["refseq_id1", "refseq_id2"],
-                "Impacted transcript region": ["region1", "region2"],
-                "GRCh38 coordinates": ["coor1", "coor2"],
-                "Type": ["GAIN", "GAIN"],
-                "Copy Number": [1, 3],
-                "Size": ["10", "20"],
-                "Cyto 1": ["cyto1", "cyto3"],
-                "Cyto 2": ["cyto2", "cyto4"],
-                "Gene mode of action": ["mode1", "mode2"],
-                "Variant class": ["", ""],
-                "Comments": ["", ""],
-                "new_column1": ["", ""],
-                "new_column2": ["", ""],
-                "new_column3": ["", ""],
-                "COSMIC Driver": ["", ""],
-                "COSMIC Entities": ["", ""],
-                "Paed Driver": ["", ""],
-                "Paed Entities": ["", ""],
-                "Sarc Driver": ["", ""],
-                "Sarc Entities": ["", ""],
-                "Neuro Driver": ["", ""],
-                "Neuro Entities": ["", ""],
-                "Ovary Driver": ["", ""],
-                "Ovary Entities": ["", ""],
-                "Haem Driver": ["", ""],
-                "Haem Entities": ["", ""],
-            }
-        )
-
-        assert test_output.equals(expected_output)
+        assert_frame_equal(test_output, EXPECTED_LOSS_SINGLE_ROW)
 
 
 class TestProcessFusion:
-    @pytest.mark.parametrize("test_input", [{}, {"Data": ["data1"]}])
-    def test_no_data(self, test_input, cyto):
-        test_inputs = [pd.DataFrame(test_input), (), cyto]
-        assert excel_parsing.process_fusion_SV(*test_inputs) is None
+    def test_no_data(self, cyto):
+        test_inputs = [pd.DataFrame({}), (), cyto]
+        assert excel_parsing.process_fusion_SV(*test_inputs) == (None, 0)
 
     def test_single_row(self, fusion_data, cyto):
         test_df_output, test_fusion_output, test_alternative_columns = (
             excel_parsing.process_fusion_SV(fusion_data.iloc[[1], :], (), cyto)
         )
 
-        expected_df = pd.DataFrame(
-            {
-                "Event domain": ["domain2"],
-                "Gene": ["gene2;gene3"],
-                "RefSeq IDs": ["refseq_id2"],
-                "Impacted transcript region": ["region2"],
-                "GRCh38 coordinates": ["coor2"],
-                "Type": ["type1"],
-                "Fusion_1": ["type2"],
-                "Size": ["200,000"],
-                (
-                    "Population germline allele frequency (GESG | GECG for "
-                    "somatic SVs or AF | AUC for germline CNVs)"
-                ): ["freq2"],
-                "Paired reads": ["7/133"],
-                "Split reads": [""],
-                "Cyto\nGene_1": ["-"],
-                "Cyto\nGene_2": ["cyto2"],
-                "Gene mode of action": ["mode2"],
-                "Variant class": [""],
-                "Comments": [""],
-                "OG_Fusion": [""],
-                "OG_IntDup": [""],
-                "OG_IntDel": [""],
-                "Disruptive": [""],
-                "Gene_1": ["gene2"],
-                "Gene_2": ["gene3"],
-            }
-        )
-
-        assert (
-            test_df_output.equals(expected_df)
-            and test_fusion_output == 1
-            and test_alternative_columns == {}
-        )
+        assert_frame_equal(test_df_output, EXPECTED_FUSION_SINGLE_ROW)
+        assert test_fusion_output == 1
+        assert test_alternative_columns == {}
 
     def test_multiple_rows(self, fusion_data, cyto):
         test_df_output, test_fusion_output, test_alternative_columns = (
-            excel_parsing.process_fusion_SV(fusion_data, (), cyto)
+            excel_parsing.process_fusion_SV(
+                excel_parsing.split_structural_variants(fusion_data)["fusion"],
+                (),
+                cyto,
+            )
         )
 
-        expected_df = pd.DataFrame(
-            {
-                "Event domain": ["domain2", "domain3"],
-                "Gene": ["gene2;gene3", "gene4;gene5;gene6"],
-                "RefSeq IDs": ["refseq_id2", "refseq_id3"],
-                "Impacted transcript region": ["region2", "region3"],
-                "GRCh38 coordinates": ["coor2", "coor3"],
-                "Type": ["type1", "type3"],
-                "Fusion_1": ["type2", "type4"],
-                "Fusion_2": [None, "type5"],
-                "Size": ["200,000", "300,000"],
-                (
-                    "Population germline allele frequency (GESG | GECG for "
-                    "somatic SVs or AF | AUC for germline CNVs)"
-                ): ["freq2", "freq3"],
-                "Paired reads": ["7/133", "1/69"],
-                "Split reads": ["", "18/95"],
-                "Cyto\nGene_1": ["-", "cyto3"],
-                "Cyto\nGene_2": ["cyto2", "-"],
-                "Cyto\nGene_3": ["-", "-"],
-                "Gene mode of action": ["mode2", "mode3"],
-                "Variant class": ["", ""],
-                "Comments": ["", ""],
-                "OG_Fusion": ["", ""],
-                "OG_IntDup": ["", ""],
-                "OG_IntDel": ["", ""],
-                "Disruptive": ["", ""],
-                "Gene_1": ["gene2", "gene4"],
-                "Gene_2": ["gene3", "gene5"],
-                "Gene_3": [None, "gene6"],
-            }
-        )
+        assert_frame_equal(test_df_output, EXPECTED_FUSION_MULTIPLE_ROWS)
+        assert test_fusion_output == 2
+        assert test_alternative_columns == {}
 
-        assert (
-            test_df_output.equals(expected_df)
-            and test_fusion_output == 2
-            and test_alternative_columns == {}
+    @pytest.mark.parametrize(
+        "test_input, paired_reads, split_reads",
+        [
+            ("PR-7/133", "7/133", ""),
+            ("SR-16/216", "", "16/216"),
+            ("PR-0/219;SR-16/216", "0/219", "16/216"),
+            ("SR-16/216;PR-0/219", "0/219", "16/216"),
+            ("", "", ""),
+        ],
+    )
+    def test_confidence_support(
+        self, fusion_data, cyto, test_input, paired_reads, split_reads
+    ):
+        test_data = fusion_data.iloc[[1], :].copy()
+        test_data["Confidence/support"] = [test_input]
+
+        test_df_output, _, _ = excel_parsing.process_fusion_SV(
+            test_data, (), cyto
         )
 
+        assert test_df_output["Paired reads"].to_list() == [paired_reads]
+        assert test_df_output["Split reads"].to_list() == [split_reads]
+
 
 class TestProcessRefgene:
     def test_process_data(self):
@@ -760,67 +924,15 @@ class TestProcessRefgene:
             }
         )
 
-        expected_output = pd.DataFrame(
-            {
-                "Gene": ["gene1", "gene2", "gene3", "gene4"],
-                "Comments": ["somatic_data1", np.nan, "somatic_data4", np.nan],
-                "COSMIC_Alteration": [
-                    "somatic_data2",
-                    np.nan,
-                    "somatic_data5",
-                    np.nan,
-                ],
-                "COSMIC_Entities": [
-                    "somatic_data3",
-                    np.nan,
-                    "somatic_data6",
-                    np.nan,
-                ],
-                "Haem_Alteration": [np.nan, "haem_data1", np.nan, np.nan],
-                "Haem_Entities": [np.nan, "haem_data2", np.nan, np.nan],
-                "Haem_Comments": [np.nan, "haem_data3", np.nan, np.nan],
-                "Paed_Alteration": ["paed_data1", np.nan, np.nan, np.nan],
-                "Paed_Entities": ["paed_data2", np.nan, np.nan, np.nan],
-                "Paed_Comments": ["paed_data3", np.nan, np.nan, np.nan],
-                "Ovarian_Alteration": [
-                    np.nan,
-                    np.nan,
-                    "ovarian_data1",
-                    np.nan,
-                ],
-                "Ovarian_Entities": [np.nan, np.nan, "ovarian_data2", np.nan],
-                "Ovarian_Comments": [np.nan, np.nan, "ovarian_data3", np.nan],
-                "Sarcoma_Alteration": [np.nan, np.nan, np.nan, "sarc_data1"],
-                "Sarcoma_Entites": [np.nan, np.nan, np.nan, "sarc_data2"],
-                "Sarcoma_Comments": [np.nan, np.nan, np.nan, "sarc_data3"],
-                "Neuro_Alteration": [
-                    "neuro_data5",
-                    "neuro_data1",
-                    np.nan,
-                    np.nan,
-                ],
-                "Neuro_Entities": [
-                    "neuro_data6",
-                    "neuro_data2",
-                    np.nan,
-                    np.nan,
-                ],
-                "Neuro_Comments": [
-                    "neuro_data7",
-                    "neuro_data3",
-                    np.nan,
-                    np.nan,
-                ],
-            }
-        )
-
-        assert test_output.equals(expected_output)
+        assert_frame_equal(test_output, EXPECTED_REFGENE)
 
 
 class TestLookupDataFromVariants:
     def test_process_data(self, refgene_data):
+        # the refgene data is shared by the session and the lookups add their
+        # columns to the given dataframe
         test_output = excel_parsing.lookup_data_from_variants(
-            refgene_data,
+            refgene_data.copy(),
             **{
                 "somatic": pd.DataFrame(
                     {
@@ -840,27 +952,4 @@ class TestLookupDataFromVariants:
             },
         )
 
-        expected_output = pd.DataFrame(
-            {
-                "Gene": ["gene1", "gene2", "gene3"],
-                "Alteration": ["alt1", "alt2", ""],
-                "Entities": ["ent1", "ent2", ""],
-                "Paed_Alteration": ["paed_alt1", "", "paed_alt2"],
-                "Paed_Entities": ["paed_ent1", "", "paed_alt2"],
-                "Sarcoma_Alteration": ["", "sarc_alt1", "sarc_alt2"],
-                "Sarcoma_Entities": ["", "sarc_ent1", "sarc_alt2"],
-                "Neuro_Alteration": ["", "", "neuro_alt1"],
-                "Neuro_Entities": ["", "", "neuro_ent1"],
-                "Ovarian_Alteration": ["", "", ""],
-                "Ovarian_Entities": ["", "", ""],
-                "Haem_Alteration": ["haem_alt1", "haem_alt2", "haem_alt3"],
-                "Haem_Entities": ["haem_ent1", "haem_ent2", "haem_ent3"],
-                "SNV": ["data1", "-", "-"],
-                "CN": ["-", "1", "3"],
-                "SV_gene_1": ["type1", "-", "-"],
-                "SV_gene_2": ["-", "type1", "-"],
-                "On Target": ["Y", "Y", "Y"],
-            }
-        )
-
-        assert test_output.equals(expected_output)
+        assert_frame_equal(test_output, EXPECTED_REFGENE_WITH_VARIANT_DATA)
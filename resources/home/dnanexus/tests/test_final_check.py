@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+import final_check
+
+
+class TestJoinColumns:
+    def test_empty_dataframe(self):
+        test_output = final_check.join_columns(pd.DataFrame({}))
+
+        assert test_output.tolist() == []
+
+    def test_join_rows(self):
+        test_output = final_check.join_columns(
+            pd.DataFrame({"Gene": ["gene1", "gene2"], "Coor": ["c1", "c2"]})
+        )
+
+        assert test_output.tolist() == ["gene1 - c1", "gene2 - c2"]
+
+    def test_empty_cells(self):
+        test_output = final_check.join_columns(
+            pd.DataFrame({"Gene": [np.nan, "gene2"], "Coor": ["c1", np.nan]})
+        )
+
+        assert test_output.tolist() == [" - c1", "gene2 - "]
+
+
+class TestCompareGainCnvs:
+    def test_same_variants_with_empty_cells(self):
+        test_input = pd.DataFrame(
+            {
+                "Gene": [np.nan, "gene2"],
+                "GRCh38 coordinates": ["coor1", "coor2"],
+            }
+        )
+        test_output = pd.DataFrame(
+            {
+                "Gene": ["gene2", np.nan],
+                "GRCh38 coordinates": ["coor2", "coor1"],
+            }
+        )
+
+        assert final_check.compare_gain_cnvs(test_output, test_input) == (
+            [],
+            [],
+        )
+
+    def test_different_variants_with_empty_cells(self):
+        test_input = pd.DataFrame(
+            {
+                "Gene": [np.nan, "gene2"],
+                "GRCh38 coordinates": ["coor1", "coor2"],
+            }
+        )
+        test_output = pd.DataFrame(
+            {
+                "Gene": [np.nan, "gene3"],
+                "GRCh38 coordinates": ["coor1", "coor3"],
+            }
+        )
+
+        assert final_check.compare_gain_cnvs(test_output, test_input) == (
+            ["gene2 - coor2"],
+            ["gene3 - coor3"],
+        )
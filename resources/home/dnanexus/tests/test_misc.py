@@ -1,6 +1,7 @@
 from types import ModuleType
 
 import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
 import pytest
 
 from utils import misc
@@ -85,40 +86,6 @@ class TestMergeDicts:
         assert test_output == expected_output
 
 
-class TestSplitConfidenceSupport:
-    def test_PR_only(self):
-        test_input = "PR-1"
-
-        test_output = misc.split_confidence_support(test_input)
-        expected_output = ["1", ""]
-
-        assert test_output == expected_output
-
-    def test_SR_only(self):
-        test_input = "SR-1"
-
-        test_output = misc.split_confidence_support(test_input)
-        expected_output = ["", "1"]
-
-        assert test_output == expected_output
-
-    def test_PR_and_SR(self):
-        test_input = "PR-1;SR-2"
-
-        test_output = misc.split_confidence_support(test_input)
-        expected_output = ["1", "2"]
-
-        assert test_output == expected_output
-
-    def test_PR_and_SR_wrong_order(self):
-        test_input = "SR-2;PR-1"
-
-        test_output = misc.split_confidence_support(test_input)
-        expected_output = ["1", "2"]
-
-        assert test_output == expected_output
-
-
 class TestRemoveEverythingButSVIG:
     def test_remove_when_no_SVIG(self):
         test_output = misc.remove_everything_but_SVIG("No SVIG")
@@ -131,13 +98,12 @@ class TestRemoveEverythingButSVIG:
         assert test_output == "[SVIG]"
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def df_with_many_columns():
     test_input = pd.DataFrame(
         columns=[f"col{col_nb}" for col_nb in range(1, 500)]
     )
-    yield test_input
-    del test_input
+    return test_input
 
 
 class TestGetColumnLetterUsingColumnName:
@@ -204,6 +170,17 @@ class TestConvert3LetterProteinTo1:
     def test_string_in_mapping(self, test_input, expected):
         assert misc.convert_3_letter_protein_to_1(test_input) == expected
 
+    @pytest.mark.parametrize(
+        "test_input, expected",
+        [
+            ("p.Leu40Arg", "p.L40R"),
+            ("p.Glu746_Ala750del", "p.E746_A750del"),
+            ("p.Trp288CysfsTer12", "p.W288CfsTer12"),
+        ],
+    )
+    def test_protein_change(self, test_input, expected):
+        assert misc.convert_3_letter_protein_to_1(test_input) == expected
+
     @pytest.mark.parametrize(
         "test_input, expected",
         [("GLU", "GLU"), ("Blarg", "Blarg"), ("", ""), ("1", "1")],
@@ -234,9 +211,9 @@ class TestLookupDf:
         test_output = misc.lookup_df(
             test_target_df, "col", test_ref_df, "col1", "col2"
         )
-        expected_output = pd.Series(["-", "-"])
+        expected_output = pd.Series(["-", "-"], name="col")
 
-        assert test_output.equals(expected_output)
+        assert_series_equal(test_output, expected_output)
 
     def test_lookup_df_single_equal_value(self):
         test_target_df = pd.DataFrame({"col": ["gene1", "gene2"]})
@@ -247,9 +224,9 @@ class TestLookupDf:
         test_output = misc.lookup_df(
             test_target_df, "col", test_ref_df, "col1", "col2"
         )
-        expected_output = pd.Series(["-", "value1"])
+        expected_output = pd.Series(["-", "value1"], name="col")
 
-        assert test_output.equals(expected_output)
+        assert_series_equal(test_output, expected_output)
 
     def test_lookup_df_multiple_equal_value(self):
         test_target_df = pd.DataFrame({"col": ["gene1", "gene2"]})
@@ -260,9 +237,9 @@ class TestLookupDf:
         test_output = misc.lookup_df(
             test_target_df, "col", test_ref_df, "col1", "col2"
         )
-        expected_output = pd.Series(["value1", "value2"])
+        expected_output = pd.Series(["value1", "value2"], name="col")
 
-        assert test_output.equals(expected_output)
+        assert_series_equal(test_output, expected_output)
 
     def test_lookup_df_concatenate_values(self):
         test_target_df = pd.DataFrame({"col": ["gene1", "gene2"]})
@@ -273,6 +250,56 @@ class TestLookupDf:
         test_output = misc.lookup_df(
             test_target_df, "col", test_ref_df, "col1", "col2"
         )
-        expected_output = pd.Series(["value1,value2", "-"])
+        expected_output = pd.Series(["value1,value2", "-"], name="col")
+
+        assert_series_equal(test_output, expected_output)
+
+
+class TestBuildLookupDict:
+    def test_build_lookup_dict_concatenate_values(self):
+        test_ref_df = pd.DataFrame(
+            {
+                "col1": ["gene1", "gene1", "gene2", "gene3"],
+                "col2": ["value1", "value2", 0, None],
+            }
+        )
+
+        test_output = misc.build_lookup_dict(test_ref_df, "col1", "col2")
+        expected_output = {"gene1": "value1,value2", "gene2": "0", "gene3": ""}
+
+        assert test_output == expected_output
+
+
+class TestBuildLookupTable:
+    def test_build_lookup_table_multiple_columns(self):
+        test_ref_df = pd.DataFrame(
+            {
+                "col1": ["gene1", "gene1", "gene2"],
+                "col2": ["value1", "value2", "value3"],
+                "col3": ["value4", None, "value5"],
+            }
+        )
+
+        test_output = misc.build_lookup_table(
+            test_ref_df, "col1", ["col2", "col3"]
+        )
+        expected_output = pd.DataFrame(
+            {
+                "col2": ["value1,value2", "value3"],
+                "col3": ["value4,", "value5"],
+            },
+            index=pd.Index(["gene1", "gene2"], name="col1"),
+        )
+
+        assert_frame_equal(test_output, expected_output)
+
+
+class TestMapLookupDict:
+    def test_map_lookup_dict_missing_values(self):
+        test_target = pd.Series(["gene1", "gene2", "gene3"])
+        test_dict = {"gene1": "value1", "gene2": ""}
+
+        test_output = misc.map_lookup_dict(test_target, test_dict)
+        expected_output = pd.Series(["value1", "-", "-"])
 
-        assert test_output.equals(expected_output)
+        assert_series_equal(test_output, expected_output)
@@ -0,0 +1,106 @@
+import shutil
+
+import pysam
+import pytest
+
+from utils import vcf
+
+# clinvar like resource, the contigs are not defined in the header
+CLINVAR_VCF = (
+    "##fileformat=VCFv4.1\n"
+    '##INFO=<ID=CLNSIG,Number=.,Type=String,Description="sig">\n'
+    '##INFO=<ID=CLNSIGCONF,Number=.,Type=String,Description="sigconf">\n'
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+    "1\t100\t111\tA\tG\t.\t.\tCLNSIG=Pathogenic\n"
+    "1\t200\t222\tC\tT,G\t.\t.\tCLNSIGCONF=Benign(1),Pathogenic(2)\n"
+    "2\t300\t333\tG\tA\t.\t.\tCLNSIG=Benign;CLNSIGCONF=Benign(2)\n"
+    "2\t400\t444\tT\tC\t.\t.\t.\n"
+)
+
+
+@pytest.fixture(scope="session")
+def clinvar_vcf(tmp_path_factory):
+    path = tmp_path_factory.mktemp("clinvar") / "clinvar.vcf"
+    path.write_text(CLINVAR_VCF)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def indexed_clinvar_vcf(clinvar_vcf, tmp_path_factory):
+    vcf_gz = pysam.tabix_index(clinvar_vcf, preset="vcf", keep_original=True)
+
+    # the app downloads the index in a different folder than the vcf
+    index = str(tmp_path_factory.mktemp("clinvar_index") / "clinvar.tbi")
+    shutil.move(f"{vcf_gz}.tbi", index)
+
+    return vcf_gz, index
+
+
+class TestOpenVcf:
+    def test_without_index(self, clinvar_vcf):
+        with vcf.open_vcf(clinvar_vcf) as vcf_reader:
+            assert [record.id for record in vcf_reader] == [
+                "111",
+                "222",
+                "333",
+                "444",
+            ]
+
+    def test_index_in_another_folder(self, indexed_clinvar_vcf):
+        vcf_gz, index = indexed_clinvar_vcf
+
+        with vcf.open_vcf(vcf_gz, index) as vcf_reader:
+            assert list(vcf_reader.index) == ["1", "2"]
+
+
+class TestGetClinvarInfo:
+    expected_output = {
+        "111": {"change": "A>G", "clnsig": [["Pathogenic"]]},
+        "222": {
+            "change": "C>T",
+            "clnsigconf": [["Benign(1)", "Pathogenic(2)"]],
+        },
+        "333": {
+            "change": "G>A",
+            "clnsigconf": [["Benign(2)"]],
+            "clnsig": [["Benign"]],
+        },
+        "444": {"change": "T>C"},
+    }
+
+    def test_uncompressed_vcf(self, clinvar_vcf):
+        with vcf.open_vcf(clinvar_vcf) as vcf_reader:
+            test_output = vcf.get_clinvar_info(vcf_reader)
+
+        assert test_output == self.expected_output
+
+    def test_indexed_vcf(self, indexed_clinvar_vcf):
+        with vcf.open_vcf(*indexed_clinvar_vcf) as vcf_reader:
+            test_output = vcf.get_clinvar_info(vcf_reader)
+
+        assert test_output == self.expected_output
+
+    def test_no_contig_warnings(self, clinvar_vcf, capfd):
+        with vcf.open_vcf(clinvar_vcf) as vcf_reader:
+            vcf.get_clinvar_info(vcf_reader)
+
+        assert "is not defined in the header" not in capfd.readouterr().err
+
+    def test_verbosity_restored(self, clinvar_vcf):
+        previous_verbosity = pysam.set_verbosity(3)
+
+        try:
+            with vcf.open_vcf(clinvar_vcf) as vcf_reader:
+                vcf.get_clinvar_info(vcf_reader)
+
+            assert pysam.set_verbosity(3) == 3
+        finally:
+            pysam.set_verbosity(previous_verbosity)
+
+    def test_multiple_ids(self, tmp_path):
+        path = tmp_path / "multiple_ids.vcf"
+        path.write_text(CLINVAR_VCF.replace("\t111\t", "\t111;555\t"))
+
+        with vcf.open_vcf(str(path)) as vcf_reader:
+            with pytest.raises(AssertionError, match="Invalid ID 111;555"):
+                vcf.get_clinvar_info(vcf_reader)
@@ -1,8 +1,28 @@
+from functools import lru_cache
 import os
 
 import dxpy
 
 
+@lru_cache(maxsize=1)
+def describe_job(job_id: str) -> dict:
+    """Describe the job, the description is cached as it is shared by the
+    functions getting info about the job
+
+    Parameters
+    ----------
+    job_id : str
+        DNAnexus job id
+
+    Returns
+    -------
+    dict
+        Description of the job
+    """
+
+    return dxpy.DXJob(job_id).describe()
+
+
 def get_refgene_input_file_info():
     """Get info from the refgene input file
 
@@ -15,9 +35,10 @@ def get_refgene_input_file_info():
     job_id = os.environ.get("DX_JOB_ID", None)
 
     if job_id:
-        job = dxpy.DXJob(job_id)
         refgene_file = dxpy.DXFile(
-            job.describe()["input"]["reference_gene_groups"]["$dnanexus_link"]
+            describe_job(job_id)["input"]["reference_gene_groups"][
+                "$dnanexus_link"
+            ]
         )
         refgene_info = f"{refgene_file.name} - {refgene_file.id}"
     else:
@@ -38,8 +59,7 @@ def get_app_version():
     job_id = os.environ.get("DX_JOB_ID", None)
 
     if job_id:
-        job = dxpy.DXJob(job_id)
-        app_version = dxpy.DXApp(job.describe()["executable"]).version
+        app_version = dxpy.DXApp(describe_job(job_id)["executable"]).version
     else:
         app_version = "App not retrievable"
 
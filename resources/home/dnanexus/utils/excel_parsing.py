@@ -1,9 +1,18 @@
+from functools import partial
 import re
 import pandas as pd
 
 from configs import tables, sv, refgene
 from utils import misc, vcf
 
+# pandas readers to use for each type of input, the reference excels are only
+# read for their values, calamine reads them without building the openpyxl
+# cells
+READERS = {
+    "csv": pd.read_csv,
+    "xls": partial(pd.read_excel, sheet_name=None, engine="calamine"),
+}
+
 
 def open_file(file: str, file_type: str) -> pd.DataFrame:
     """Read in CSV or XLS files using pandas
@@ -21,23 +30,51 @@ def open_file(file: str, file_type: str) -> pd.DataFrame:
         Dataframe created by pandas
     """
 
-    if file_type == "csv":
-        df = pd.read_csv(file)
-    elif file_type == "xls":
-        df = pd.read_excel(file, sheet_name=None)
+    if file_type not in READERS:
+        raise ValueError(f"Cannot open {file} with file type {file_type}")
 
-    return df
+    return READERS[file_type](file)
+
+
+def split_reported_variants(df: pd.DataFrame) -> dict:
+    """Split the reported variants excel into the germline and somatic
+    variants
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe from parsing the reported variants excel file
+
+    Returns
+    -------
+    dict
+        Dict of the dataframes for the germline and somatic variants, the
+        dataframes are empty if the excel has no origin column
+    """
+
+    if "Origin" not in df:
+        no_variants = df.iloc[0:0]
+        return {"germline": no_variants, "somatic": no_variants}
+
+    # lowercase the origins once for both variant origins
+    origins = df["Origin"].str.lower()
+
+    return {
+        "germline": df[origins == "germline"],
+        "somatic": df[origins.str.contains("somatic", regex=False)],
+    }
 
 
 def process_reported_variants_germline(
     df: pd.DataFrame, clinvar_dict: dict, panelapp_dfs: dict
 ) -> pd.DataFrame:
-    """Process the data from the reported variants excel file
+    """Process the germline variants from the reported variants excel file
 
     Parameters
     ----------
     df : pd.DataFrame
-        Dataframe from parsing the reported variants excel file
+        Dataframe containing the germline variants from the reported variants
+        excel file
     clinvar_dict : dict
         Dict containing Clinvar data
     panelapp_dfs : dict
@@ -49,20 +86,15 @@ def process_reported_variants_germline(
         Dataframe containing clinical significance info for germline variants
     """
 
-    if "Origin" not in df:
-        return None
-
-    df = df[df["Origin"].str.lower() == "germline"]
-
     if df.empty:
         return None
 
+    df = df.reset_index(drop=True)
+
     # convert the clinvar id column as a string and remove the trailing .0 that
     # the automatic conversion that pandas applies added
     df["ClinVar ID"] = df["ClinVar ID"].apply(misc.clean_clinvar_id_column)
 
-    df.reset_index(drop=True, inplace=True)
-
     df = vcf.find_clinvar_info(
         clinvar_dict,
         df[
@@ -149,14 +181,16 @@ def process_reported_variants_somatic(
     hotspots_df: pd.DataFrame,
     cyto_df: dict,
 ) -> pd.DataFrame:
-    """Get the somatic variants and format the data for them
+    """Format the data for the somatic variants
 
     Parameters
     ----------
     df : pd.DataFrame
-        Dataframe from parsing the reported variants excel file
+        Dataframe containing the somatic variants from the reported variants
+        excel file
     lookup_refgene : tuple
-        Tuple of data allowing lookup in the refgene dataframes
+        Tuple of column to write, column to map and lookup dict or series
+        allowing lookup in the refgene data
     hotspots_df : pd.DataFrame
         Dataframe containing data from the parsed hotspots excel
     cyto_df : dict
@@ -168,46 +202,38 @@ def process_reported_variants_somatic(
         Dataframe with additional formatting for c. and p. annotation
     """
 
-    if "Origin" not in df:
-        return None
-
-    # select only somatic rows
-    df = df[df["Origin"].str.lower().str.contains("somatic")]
-
     if df.empty:
         return None
 
-    df.reset_index(drop=True, inplace=True)
-    df[["c_dot", "p_dot"]] = df["CDS change and protein change"].str.split(
-        r"(?=;p)", n=1, expand=True
-    )
-    df["p_dot"] = df["p_dot"].str.slice(1)
-
-    df["MTBP c."] = df["Gene"] + ":" + df["c_dot"]
-    df["MTBP p."] = (
-        df["Gene"]
-        + ":"
-        + df["p_dot"]
-        .apply(misc.convert_3_letter_protein_to_1)
-        .str.replace("p.", "")
-    )
-    df.fillna({"MTBP p.": ""}, inplace=True)
+    df = df.reset_index(drop=True)
 
     # move the [SVIG] info into a dedicated column
-    df.loc[:, "Canonical"] = ""
     df["Canonical"] = df["CDS change and protein change"].apply(
         misc.remove_everything_but_SVIG
     )
 
-    # remove the SVIG info from the below columns
+    # remove the SVIG info before building the MTBP columns from the c. and
+    # p. annotation so that it is only removed once
     df["CDS change and protein change"] = df[
         "CDS change and protein change"
     ].str.replace("[SVIG]", "")
-    df["MTBP c."] = df["MTBP c."].str.replace("[SVIG]", "")
-    df["MTBP p."] = df["MTBP p."].str.replace("[SVIG]", "")
 
-    df["HS mutation lookup"] = df["MTBP p."].apply(
-        lambda x: re.sub(r"[A-Z]+$", "", x)
+    df[["c_dot", "p_dot"]] = df["CDS change and protein change"].str.split(
+        r"(?=;p)", n=1, expand=True
+    )
+    df["p_dot"] = df["p_dot"].str.slice(1)
+
+    df["MTBP c."] = df["Gene"].str.cat(df["c_dot"], sep=":")
+    df["MTBP p."] = df["Gene"].str.cat(
+        df["p_dot"]
+        .apply(misc.convert_3_letter_protein_to_1)
+        .str.replace("p.", ""),
+        sep=":",
+    )
+    df.fillna({"MTBP p.": ""}, inplace=True)
+
+    df["HS mutation lookup"] = df["MTBP p."].str.replace(
+        r"[A-Z]+$", "", regex=True
     )
 
     # populate the somatic variant dataframe with data from the refgene excel
@@ -216,40 +242,38 @@ def process_reported_variants_somatic(
         (
             "HS_Total",
             "HS mutation lookup",
-            hotspots_df["HS_Samples"],
-            "Gene_AA",
-            "Total",
+            misc.build_lookup_dict(
+                hotspots_df["HS_Samples"], "Gene_AA", "Total"
+            ),
         ),
         (
             "HS_Mut",
             "HS mutation lookup",
-            hotspots_df["HS_Samples"],
-            "Gene_AA",
-            "Mutations",
+            misc.build_lookup_dict(
+                hotspots_df["HS_Samples"], "Gene_AA", "Mutations"
+            ),
         ),
         (
             "HS_Tissue",
             "MTBP p.",
-            hotspots_df["HS_Tissue"],
-            "Gene_Mut",
-            "Tissue",
+            misc.build_lookup_dict(
+                hotspots_df["HS_Tissue"], "Gene_Mut", "Tissue"
+            ),
+        ),
+        (
+            "Cyto",
+            "Gene",
+            misc.build_lookup_dict(cyto_df["Cyto"], "Gene", "Cyto"),
         ),
-        ("Cyto", "Gene", cyto_df["Cyto"], "Gene", "Cyto"),
     )
 
     for (
         new_column,
         mapping_column_target_df,
-        reference_df,
-        mapping_column_ref_df,
-        col_to_look_up,
+        reference_dict,
     ) in lookup_refgene:
-        df[new_column] = misc.lookup_df(
-            df,
-            mapping_column_target_df,
-            reference_df,
-            mapping_column_ref_df,
-            col_to_look_up,
+        df[new_column] = misc.map_lookup_dict(
+            df[mapping_column_target_df], reference_dict
         )
 
     df.loc[:, "Error flag"] = ""
@@ -269,15 +293,20 @@ def process_reported_variants_somatic(
     if df["VAF_count"].max() > 0:
         df[["VAF", "LOH"]] = df["VAF"].str.split(";", expand=True)
 
-    df.loc[:, "Variant class"] = ""
-    df.loc[:, "Comments"] = ""
-    df.loc[:, "TSG_NMD"] = ""
-    df.loc[:, "TSG_LOH"] = ""
-    df.loc[:, "Splice fs?"] = ""
-    df.loc[:, "SpliceAI"] = ""
-    df.loc[:, "REVEL"] = ""
-    df.loc[:, "OG_3' Ter"] = ""
-    df.loc[:, "Recurrence somatic database"] = ""
+    # add the empty columns in one go rather than one insertion per column
+    df[
+        [
+            "Variant class",
+            "Comments",
+            "TSG_NMD",
+            "TSG_LOH",
+            "Splice fs?",
+            "SpliceAI",
+            "REVEL",
+            "OG_3' Ter",
+            "Recurrence somatic database",
+        ]
+    ] = ""
 
     df = df[
         [
@@ -336,19 +365,63 @@ def process_reported_variants_somatic(
     return df
 
 
+def split_structural_variants(df: pd.DataFrame) -> dict:
+    """Split the reported structural variants excel into the gain, loss and
+    fusion variants
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe containing data from the structural variants excel
+
+    Returns
+    -------
+    dict
+        Dict of the dataframes for the gain, loss and fusion variants, the
+        dataframes are empty if the excel has no type column
+    """
+
+    if "Type" not in df.columns:
+        no_variants = df.iloc[0:0]
+        return {
+            "gain": no_variants,
+            "loss": no_variants,
+            "fusion": no_variants,
+        }
+
+    # lowercase the types once for all the variant types
+    types = df["Type"].str.lower()
+
+    # the types are fixed words, compare them as plain strings
+    is_gain = types.str.startswith("gain")
+    is_loss = types.str.startswith(("loss", "loh"))
+    has_cnv_type = (
+        types.str.contains("gain", regex=False)
+        | types.str.contains("loss", regex=False)
+        | types.str.contains("loh", regex=False)
+    )
+
+    return {
+        "gain": df[is_gain],
+        "loss": df[is_loss],
+        "fusion": df[~has_cnv_type],
+    }
+
+
 def process_reported_SV(
-    df: pd.DataFrame, lookup_refgene: tuple, type_sv: str, *check_columns
+    df: pd.DataFrame, lookup_refgene: tuple, *check_columns
 ) -> pd.DataFrame:
-    """Process the reported structural variants excel
+    """Process the gain or loss variants of the reported structural variants
+    excel
 
     Parameters
     ----------
     df : pd.DataFrame
-        Dataframe containing data from the structural variants excel
+        Dataframe containing the gain or loss variants from the structural
+        variants excel
     lookup_refgene : tuple
-        Tuple of data allowing lookup in the refgene dataframes
-    type_sv: str
-        Type of structural variant to look at in the function
+        Tuple of column to write, column to map and lookup dict or series
+        allowing lookup in the refgene data
 
     Returns
     -------
@@ -356,44 +429,29 @@ def process_reported_SV(
         Dataframe for variants with the given SV type
     """
 
-    if "Type" not in df.columns:
-        return None
-
-    sv_df = df[df["Type"].str.lower().str.match(type_sv)]
-
-    if sv_df.empty:
+    if df.empty:
         return None
 
-    sv_df.reset_index(drop=True, inplace=True)
+    sv_df = df.reset_index(drop=True)
 
     # populate the structural variant dataframe with data from the refgene
     # excel file
     for (
         new_column,
         mapping_column_target_df,
-        reference_df,
-        mapping_column_ref_df,
-        col_to_look_up,
+        reference_dict,
     ) in lookup_refgene:
-        sv_df[new_column] = misc.lookup_df(
-            sv_df,
-            mapping_column_target_df,
-            reference_df,
-            mapping_column_ref_df,
-            col_to_look_up,
+        sv_df[new_column] = misc.map_lookup_dict(
+            sv_df[mapping_column_target_df], reference_dict
         )
 
-    sv_df.loc[:, "Variant class"] = ""
-    sv_df.loc[:, "Comments"] = ""
-
-    for column in check_columns:
-        sv_df.loc[:, column] = ""
+    sv_df[["Variant class", "Comments", *check_columns]] = ""
 
     sv_df[["Type", "Copy Number"]] = sv_df.Type.str.split(
         r"\(|\)", expand=True
     ).iloc[:, [0, 1]]
     sv_df["Copy Number"] = sv_df["Copy Number"].astype(int)
-    sv_df["Size"] = sv_df.apply(lambda x: "{:,.0f}".format(x["Size"]), axis=1)
+    sv_df["Size"] = sv_df["Size"].map("{:,.0f}".format)
     sv_df[["Cyto 1", "Cyto 2"]] = sv_df["Chromosomal bands"].str.split(
         ";", expand=True
     )
@@ -455,9 +513,11 @@ def process_fusion_SV(
     Parameters
     ----------
     df : pd.DataFrame
-        Dataframe containing the data from the structural variant excel
+        Dataframe containing the fusion variants from the structural variant
+        excel
     lookup_refgene : tuple
-        Tuple of data allowing lookup in the refgene dataframes
+        Tuple of column to write, column to map and lookup dict or series
+        allowing lookup in the refgene data
     cyto_df : dict
         Dict containing dataframe of data per sheet for cytological bands
 
@@ -468,15 +528,10 @@ def process_fusion_SV(
         - Max number of fusion
     """
 
-    if "Type" not in df.columns:
-        return None
-
-    df_SV = df[~df["Type"].str.lower().str.contains("loss|loh|gain")]
-
-    if df_SV.empty:
+    if df.empty:
         return None, 0
 
-    df_SV.reset_index(drop=True, inplace=True)
+    df_SV = df.reset_index(drop=True)
 
     # split fusion columns
     df_SV["fusion_count"] = df_SV["Type"].str.count(r"\;")
@@ -495,15 +550,19 @@ def process_fusion_SV(
     df_SV = pd.concat([df_SV, inter_df], axis=1)
 
     # remove prefixes for single reads and paired reads and store in separate
-    # columns
-    df_SV[["Paired reads", "Split reads"]] = (
-        df_SV["Confidence/support"]
-        .apply(misc.split_confidence_support)
-        .to_list()
-    )
+    # columns, the elements can be in any order so extract them separately
+    for new_column, read_type in (
+        ("Paired reads", "PR"),
+        ("Split reads", "SR"),
+    ):
+        df_SV[new_column] = (
+            df_SV["Confidence/support"]
+            .str.extract(rf"(?:^|;){read_type}-([^;]*)", expand=False)
+            .fillna("")
+        )
 
     # get thousands separator
-    df_SV["Size"] = df_SV.apply(lambda x: "{:,.0f}".format(x["Size"]), axis=1)
+    df_SV["Size"] = df_SV["Size"].map("{:,.0f}".format)
 
     # replace nan in size with empty string
     df_SV.fillna({"Size": ""}, inplace=True)
@@ -527,26 +586,24 @@ def process_fusion_SV(
     cyto_cols = []
 
     lookup_refgene = lookup_refgene + (
-        ("Cyto", "Gene", cyto_df["Cyto"], "Gene", "Cyto"),
+        (
+            "Cyto",
+            "Gene",
+            misc.build_lookup_dict(cyto_df["Cyto"], "Gene", "Cyto"),
+        ),
     )
 
     for (
         new_column,
         mapping_column_target_df,
-        reference_df,
-        mapping_column_ref_df,
-        col_to_look_up,
+        reference_dict,
     ) in lookup_refgene:
         for gene in gene_col:
             column_to_write = f"{new_column}\n{gene}"
             mapping_column_target_df = gene
 
-            df_SV[column_to_write] = misc.lookup_df(
-                df_SV,
-                mapping_column_target_df,
-                reference_df,
-                mapping_column_ref_df,
-                col_to_look_up,
+            df_SV[column_to_write] = misc.map_lookup_dict(
+                df_SV[mapping_column_target_df], reference_dict
             )
 
             # store the cyto columns apart from the other lookup groups to
@@ -564,17 +621,21 @@ def process_fusion_SV(
         for gene_num in range(1, max_num_gene +1):
             # [\w\s]* any alphanumeric character and any whitespace character multiple times
             # will catch " Driver\n" and " Entities\n"
-            string_to_match= lookup_type + "[\w\s]*Gene_" + str(gene_num)
+            string_to_match= lookup_type + r"[\w\s]*Gene_" + str(gene_num)
             pattern = re.compile(string_to_match)
             cols = list(filter(pattern.match,lookup_cols))
             lookup_reorder.extend(cols)
 
-    df_SV.loc[:, "Variant class"] = ""
-    df_SV.loc[:, "Comments"] = ""
-    df_SV.loc[:, "OG_Fusion"] = ""
-    df_SV.loc[:, "OG_IntDup"] = ""
-    df_SV.loc[:, "OG_IntDel"] = ""
-    df_SV.loc[:, "Disruptive"] = ""
+    df_SV[
+        [
+            "Variant class",
+            "Comments",
+            "OG_Fusion",
+            "OG_IntDup",
+            "OG_IntDel",
+            "Disruptive",
+        ]
+    ] = ""
 
     expected_columns = sv.CONFIG["expected_columns"]
     alternatives = sv.CONFIG["alternative_columns"]
@@ -661,6 +722,10 @@ def process_refgene(dfs: dict) -> dict:
                 df, how="outer", on="Gene"
             )
 
+    # the gene column is used as the key of all the lookups, storing it as a
+    # category allows pandas to use the codes instead of hashing the strings
+    output_dataframe["Gene"] = output_dataframe["Gene"].astype("category")
+
     return output_dataframe
 
 
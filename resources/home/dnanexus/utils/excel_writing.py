@@ -3,6 +3,7 @@ import openpyxl
 from openpyxl import drawing
 from openpyxl.formatting.rule import DataBarRule
 from openpyxl.styles import Alignment, DEFAULT_FONT, Font
+from openpyxl.utils.cell import range_boundaries
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.worksheet.worksheet import Worksheet
 import pandas as pd
@@ -13,6 +14,9 @@ from utils import misc
 
 pd.options.mode.chained_assignment = None
 
+# style objects are shared by all the cells using them, create them once
+BOLD_FONT = Font(bold=True, name=DEFAULT_FONT.name)
+
 
 def write_sheet(
     excel_writer: pd.ExcelWriter,
@@ -186,8 +190,17 @@ def apply_alignment_data(sheet: Worksheet, config_data: list):
         List of cells to align
     """
 
+    # the configs use a handful of alignments for many cells, create each of
+    # them only once
+    alignments = {}
+
     for cell, alignment in config_data:
-        sheet[cell].alignment = Alignment(**alignment)
+        alignment_key = tuple(alignment.items())
+
+        if alignment_key not in alignments:
+            alignments[alignment_key] = Alignment(**alignment)
+
+        sheet[cell].alignment = alignments[alignment_key]
 
 
 def bold_cells(sheet: Worksheet, config_data: list):
@@ -202,7 +215,7 @@ def bold_cells(sheet: Worksheet, config_data: list):
     """
 
     for cell in config_data:
-        sheet[cell].font = Font(bold=True, name=DEFAULT_FONT.name)
+        sheet[cell].font = BOLD_FONT
 
 
 def set_col_width(sheet: Worksheet, config_data: list):
@@ -268,9 +281,13 @@ def draw_borders(sheet: Worksheet, config_data: dict):
 
     if config_data.get("cell_rows"):
         for cell_range, type_border in config_data["cell_rows"]:
-            for cells in sheet[cell_range]:
-                for cell in cells:
-                    cell.border = type_border
+            # get the cells from the bounds of the range instead of building
+            # the tuples of cells from the range string
+            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+
+            for row in range(min_row, max_row + 1):
+                for column in range(min_col, max_col + 1):
+                    sheet.cell(row=row, column=column).border = type_border
 
 
 def generate_dropdowns(sheet: Worksheet, config_data: dict):
@@ -286,8 +303,13 @@ def generate_dropdowns(sheet: Worksheet, config_data: dict):
 
     for dropdown_info in config_data:
         for cells, options in dropdown_info["cells"].items():
+            # give all the cells at once, adding them one by one copies the
+            # ranges of the dropdown for every cell
             dropdown = DataValidation(
-                type="list", formula1=options, allow_blank=True
+                type="list",
+                formula1=options,
+                allow_blank=True,
+                sqref=" ".join(cells),
             )
             dropdown.prompt = "Select from the list"
             dropdown.promptTitle = dropdown_info["title"]
@@ -295,9 +317,6 @@ def generate_dropdowns(sheet: Worksheet, config_data: dict):
             dropdown.showErrorMessage = True
             sheet.add_data_validation(dropdown)
 
-            for cell in cells:
-                dropdown.add(sheet[cell])
-
 
 def insert_images(sheet: Worksheet, config_data: dict, images: list):
     """Insert images in the given worksheet for that config file
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 import re
 import urllib.request
 
@@ -43,29 +45,28 @@ def download_images(html: BeautifulSoup) -> list:
         List of images in the HTML
     """
 
-    images = []
+    image_urls = [img.get("src") for img in html.findAll("img")]
+    images = [f"figure_{i}.jpg" for i in range(1, len(image_urls) + 1)]
 
-    for i, img in enumerate(html.findAll("img"), 1):
-        img_path = f"figure_{i}.jpg"
-        urllib.request.urlretrieve(img.get("src"), img_path)
+    # the download of the images is network bound, get them at the same time
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(urllib.request.urlretrieve, image_urls, images))
 
-        if i == 2:
-            figure_2 = Image.open(img_path)
-            cropped_figure_2 = figure_2.crop((600, 600, 2400, 2400))
-            cropped_figure_2.save(img_path)
-
-        images.append(img_path)
+    if len(images) >= 2:
+        figure_2 = Image.open(images[1])
+        cropped_figure_2 = figure_2.crop((600, 600, 2400, 2400))
+        cropped_figure_2.save(images[1])
 
     return images
 
 
-def get_tables(html: str) -> list:
-    """Get all the tables in the HTML
+def get_tables(html: BeautifulSoup) -> list:
+    """Get all the tables in the BeautifulSoup object
 
     Parameters
     ----------
-    html : str
-        File path to the HTML file
+    html : BeautifulSoup
+        BeautifulSoup object
 
     Returns
     -------
@@ -73,7 +74,17 @@ def get_tables(html: str) -> list:
         List of dataframes for the tables in the HTML file
     """
 
-    return pd.read_html(html)
+    # only pass the markup of the tables to pandas instead of reading the
+    # whole HTML file again
+    tables = "".join(
+        str(table)
+        for table in html.find_all("table")
+        if table.find_parent("table") is None
+    )
+
+    # the html is already parsed with lxml, use it directly instead of letting
+    # pandas fall back on the slower bs4/html5lib flavor
+    return pd.read_html(StringIO(tables), flavor="lxml")
 
 
 def get_tag_sibling(soup: BeautifulSoup, tag: str, pattern: str) -> str:
@@ -14,6 +14,40 @@ if Path("/home/dnanexus").exists():
 else:
     CONFIG_PATH = Path("resources/home/dnanexus/configs")
 
+# excel column letters from A to ZZ, the position of the letters in the tuple
+# is the index of the column
+COLUMN_LETTERS = tuple(string.ascii_uppercase) + tuple(
+    f"{first_letter}{second_letter}"
+    for first_letter in string.ascii_uppercase
+    for second_letter in string.ascii_uppercase
+)
+COLUMN_INDEXES = {letters: i for i, letters in enumerate(COLUMN_LETTERS)}
+
+# 3 letter amino acid codes and their 1 letter equivalent
+PROTEIN_LETTERS = {
+    "Ala": "A",
+    "Arg": "R",
+    "Asn": "N",
+    "Asp": "D",
+    "Cys": "C",
+    "Gln": "Q",
+    "Glu": "E",
+    "Gly": "G",
+    "His": "H",
+    "Ile": "I",
+    "Leu": "L",
+    "Lys": "K",
+    "Met": "M",
+    "Phe": "F",
+    "Pro": "P",
+    "Ser": "S",
+    "Thr": "T",
+    "Trp": "W",
+    "Tyr": "Y",
+    "Val": "V",
+}
+PROTEIN_PATTERN = re.compile("|".join(PROTEIN_LETTERS))
+
 
 def select_config(name_config: str) -> Optional[ModuleType]:
     """Given a config name, import the appropriate module for writing the sheet
@@ -108,37 +142,6 @@ def merge_dicts(original_dict: dict, new_dict: dict) -> dict:
     return return_dict
 
 
-def split_confidence_support(value: str) -> list:
-    """Split a value for paired and single read information (used in a Pandas
-    context)
-
-    Parameters
-    ----------
-    value : str
-        String value to process
-
-    Returns
-    -------
-    list
-        2 element list containing information for the paired reads and single
-        reads (in that order)
-    """
-
-    returned_value = ["", ""]
-
-    values = value.split(";")
-
-    for v in values:
-        if "PR-" in v:
-            cleaned_value = v.replace("PR-", "")
-            returned_value[0] = cleaned_value
-        elif "SR-" in v:
-            cleaned_value = v.replace("SR-", "")
-            returned_value[1] = cleaned_value
-
-    return returned_value
-
-
 def remove_duplicate_fusion_elements(value: str) -> str:
     """Remove duplicate fusion elements
 
@@ -221,33 +224,16 @@ def get_column_letter_using_column_name(
         Corresponding letter column
     """
 
-    for i, column in enumerate(df.columns):
-        # if the number of columns is over 26, i need to add the additional
-        # letter i.e. 27th column would be AA in Excel
-        if i >= 26:
-            nb_alphabet_passes = int(i / 26)
-            i -= nb_alphabet_passes * 26
-
-            if nb_alphabet_passes <= 26:
-                additional_letter = string.ascii_uppercase[
-                    nb_alphabet_passes - 1
-                ]
-
-            else:
-                raise ValueError(
-                    "This function cannot handle more than "
-                    f"{nb_alphabet_passes * 26 + 26} columns"
-                )
-        else:
-            nb_alphabet_passes = 0
-            additional_letter = ""
+    if df.columns.empty:
+        return None
 
-        if column_name and column_name == column:
-            return f"{additional_letter}{string.ascii_uppercase[i]}"
+    # get the first position of the column, -1 if it is not present
+    index = df.columns.get_indexer_for([column_name])[0]
 
-        # reached the last column
-        if len(df.columns) - 1 == i + nb_alphabet_passes * 26:
-            return f"{additional_letter}{string.ascii_uppercase[i]}"
+    if index == -1:
+        index = len(df.columns) - 1
+
+    return convert_index_to_letters(index)
 
 
 def convert_letter_column_to_index(letters: str) -> int:
@@ -264,17 +250,13 @@ def convert_letter_column_to_index(letters: str) -> int:
         Position in the alphabet
     """
 
-    if len(letters) == 1:
-        return string.ascii_uppercase.index(letters)
-    elif len(letters) == 2:
-        return (
-            string.ascii_uppercase.index(letters[0]) + 1
-        ) * 26 + string.ascii_uppercase.index(letters[1])
-    else:
+    if letters not in COLUMN_INDEXES:
         raise ValueError(
             f"Cannot handle more than 2 letter letter column: {letters}"
         )
 
+    return COLUMN_INDEXES[letters]
+
 
 def convert_index_to_letters(index: int) -> str:
     """Convert a alphabet position into a letter
@@ -290,22 +272,13 @@ def convert_index_to_letters(index: int) -> str:
         Equivalent letter of the position in the alphabet
     """
 
-    if index >= 26:
-        nb_alphabet_passes = int(index / 26)
-        index -= nb_alphabet_passes * 26
-
-        if nb_alphabet_passes <= 26:
-            additional_letter = string.ascii_uppercase[nb_alphabet_passes - 1]
-
-        else:
-            raise ValueError(
-                "This function cannot handle more than "
-                f"{nb_alphabet_passes * 26 + 26} columns"
-            )
-    else:
-        additional_letter = ""
+    if not 0 <= index < len(COLUMN_LETTERS):
+        raise ValueError(
+            "This function cannot handle more than "
+            f"{len(COLUMN_LETTERS)} columns"
+        )
 
-    return f"{additional_letter}{string.ascii_uppercase[index]}"
+    return COLUMN_LETTERS[index]
 
 
 def convert_3_letter_protein_to_1(string_element: str) -> str:
@@ -325,35 +298,132 @@ def convert_3_letter_protein_to_1(string_element: str) -> str:
     if type(string_element) is not str:
         return string_element
 
-    mapping = {
-        "Ala": "A",
-        "Arg": "R",
-        "Asn": "N",
-        "Asp": "D",
-        "Cys": "C",
-        "Gln": "Q",
-        "Glu": "E",
-        "Gly": "G",
-        "His": "H",
-        "Ile": "I",
-        "Leu": "L",
-        "Lys": "K",
-        "Met": "M",
-        "Phe": "F",
-        "Pro": "P",
-        "Ser": "S",
-        "Thr": "T",
-        "Trp": "W",
-        "Tyr": "Y",
-        "Val": "V",
-    }
-
-    for three_letter_protein, single_letter_protein in mapping.items():
-        string_element = string_element.replace(
-            three_letter_protein, single_letter_protein
+    # single amino acid codes can be converted with one lookup
+    if string_element in PROTEIN_LETTERS:
+        return PROTEIN_LETTERS[string_element]
+
+    # convert all the codes of a protein change in one pass over the string
+    return PROTEIN_PATTERN.sub(
+        lambda match: PROTEIN_LETTERS[match.group(0)], string_element
+    )
+
+
+def convert_lookup_value(value) -> str:
+    """Convert a value of the reference data to the string to write when
+    looked up
+
+    Parameters
+    ----------
+    value
+        Value from the reference dataframe
+
+    Returns
+    -------
+    str
+        String of the value, empty string for empty or NA values
+    """
+
+    if value == 0:
+        return str(value)
+    elif not value or value is np.nan:
+        return ""
+    else:
+        return str(value)
+
+
+def build_lookup_table(
+    reference_df: pd.DataFrame,
+    mapping_column_ref_df: str,
+    cols_to_look_up: list,
+) -> pd.DataFrame:
+    """Build a dataframe indexed by the values of a column of the reference
+    dataframe containing the values of other columns
+
+    Parameters
+    ----------
+    reference_df : pd.DataFrame
+        Dataframe containing reference data that we want to add to a target
+        dataframe
+    mapping_column_ref_df : str
+        Name of the column in the reference dataframe to use as index
+    cols_to_look_up : list
+        Names of the columns containing the data that we want to add from the
+        reference dataframe
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with one row per value of the mapping column and the values
+        for that row joined by commas
+    """
+
+    # group data per key i.e. if multiple values are present for a key, they
+    # are joined together
+    return (
+        reference_df[cols_to_look_up]
+        .map(convert_lookup_value)
+        .groupby(
+            reference_df[mapping_column_ref_df],
+            sort=False,
+            dropna=False,
+            observed=True,
         )
+        .agg(",".join)
+    )
+
 
-    return string_element
+def build_lookup_dict(
+    reference_df: pd.DataFrame, mapping_column_ref_df: str, col_to_look_up: str
+) -> dict:
+    """Build a dict linking the values of a column of the reference dataframe
+    to the values of another column
+
+    Parameters
+    ----------
+    reference_df : pd.DataFrame
+        Dataframe containing reference data that we want to add to a target
+        dataframe
+    mapping_column_ref_df : str
+        Name of the column in the reference dataframe to use as keys
+    col_to_look_up : str
+        Name of the column containing the data that we want to add from the
+        reference dataframe
+
+    Returns
+    -------
+    dict
+        Dict with the values for each key joined by commas
+    """
+
+    return build_lookup_table(
+        reference_df, mapping_column_ref_df, [col_to_look_up]
+    )[col_to_look_up].to_dict()
+
+
+def map_lookup_dict(target: pd.Series, reference_dict) -> pd.Series:
+    """Map the values of a series using a lookup dict built with
+    build_lookup_dict or a column of a table built with build_lookup_table
+
+    Parameters
+    ----------
+    target : pd.Series
+        Series containing the values to map
+    reference_dict : dict or pd.Series
+        Dict or Series indexed by the values to map linking them to the
+        reference data
+
+    Returns
+    -------
+    pd.Series
+        Pandas Series containing the reference data, with "-" for values
+        without reference data
+    """
+
+    # the target can be a category which map can return as is, convert it to
+    # object in order to be able to add the "-"
+    return (
+        target.map(reference_dict).astype(object).fillna("-").replace("", "-")
+    )
 
 
 def lookup_df(
@@ -389,33 +459,9 @@ def lookup_df(
         Pandas Series containing the data to add to the target dataframe
     """
 
-    # link the mapping column to the column of target data in the ref df
-    reference_tuple = zip(
-        reference_df[mapping_column_ref_df],
-        reference_df[col_to_look_up],
+    reference_dict = build_lookup_dict(
+        reference_df, mapping_column_ref_df, col_to_look_up
     )
-    reference_dict = {}
-
-    # group data per key i.e. if multiple values are present for a key, create
-    # a list that will get joined later
-    for key, value in reference_tuple:
-        if value == 0:
-            value = str(value)
-        elif not value or value is np.nan:
-            value = ""
-        else:
-            value = str(value)
-
-        reference_dict.setdefault(key, []).append(value)
-
-    reference_dict = {
-        key: ",".join(value) for key, value in reference_dict.items()
-    }
 
     # map the reference values to the target dataframe
-    return (
-        target_df[mapping_column_target_df]
-        .map(reference_dict)
-        .fillna("-")
-        .replace("", "-")
-    )
+    return map_lookup_dict(target_df[mapping_column_target_df], reference_dict)
@@ -1,31 +1,33 @@
 import pandas as pd
-import vcfpy
+import pysam
 
 
-def open_vcf(file: str) -> vcfpy.Reader:
+def open_vcf(file: str, index_file: str = None) -> pysam.VariantFile:
     """Open VCF file
 
     Parameters
     ----------
     file : str
         File path
+    index_file : str, optional
+        Path to the index of the VCF, by default None
 
     Returns
     -------
-    vcfpy.Reader
+    pysam.VariantFile
         Reader object for the VCF
     """
 
-    return vcfpy.Reader.from_path(file)
+    return pysam.VariantFile(file, index_filename=index_file)
 
 
-def get_clinvar_info(vcf_reader: vcfpy.Reader) -> dict:
+def get_clinvar_info(vcf_reader: pysam.VariantFile) -> dict:
     """Parse the clinvar data
 
     Parameters
     ----------
-    vcf_reader : vcfpy.Reader
-        Vcfpy reader object containing the clinvar VCF resource data
+    vcf_reader : pysam.VariantFile
+        Pysam reader object containing the clinvar VCF resource data
 
     Returns
     -------
@@ -35,32 +37,43 @@ def get_clinvar_info(vcf_reader: vcfpy.Reader) -> dict:
 
     data = {}
 
-    for record in vcf_reader:
-        assert len(record.ID) == 1, f"Multiple IDs for {record.ID}"
-        record_id = str(record.ID[0])
-        clnsigconf = None
-        clnsig = None
-        alt = None
-
-        if record.INFO.get("CLNSIGCONF"):
-            clnsigconf = record.INFO.get("CLNSIGCONF")
-
-        if record.INFO.get("CLNSIG"):
-            clnsig = record.INFO.get("CLNSIG")
-
-        # the ALT value is a list of SUBSTITUTION object, so extraction is
-        # required
-        if record.ALT:
-            alt = record.ALT[0].value
-
-        data.setdefault(record_id, {})
-        data[record_id]["change"] = f"{record.REF}>{alt}"
-
-        if clnsigconf:
-            data[record_id].setdefault("clnsigconf", []).append(clnsigconf)
-
-        if clnsig:
-            data[record_id].setdefault("clnsig", []).append(clnsig)
+    # htslib warns for every record on a contig missing from the header and
+    # the clinvar resource doesn't define its contigs, only keep the errors
+    previous_verbosity = pysam.set_verbosity(1)
+
+    try:
+        for record in vcf_reader:
+            # records need a single id, multiple ids are separated by
+            # semicolons
+            assert (
+                record.id and ";" not in record.id
+            ), f"Invalid ID {record.id}"
+            record_id = record.id
+            clnsigconf = None
+            clnsig = None
+            alt = None
+
+            # pysam returns the values of the INFO fields as tuples, convert
+            # them to lists for the cleaning of the significance values
+            if record.info.get("CLNSIGCONF"):
+                clnsigconf = list(record.info.get("CLNSIGCONF"))
+
+            if record.info.get("CLNSIG"):
+                clnsig = list(record.info.get("CLNSIG"))
+
+            if record.alts:
+                alt = record.alts[0]
+
+            data.setdefault(record_id, {})
+            data[record_id]["change"] = f"{record.ref}>{alt}"
+
+            if clnsigconf:
+                data[record_id].setdefault("clnsigconf", []).append(clnsigconf)
+
+            if clnsig:
+                data[record_id].setdefault("clnsig", []).append(clnsig)
+    finally:
+        pysam.set_verbosity(previous_verbosity)
 
     return data
 